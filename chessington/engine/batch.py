@@ -0,0 +1,168 @@
+"""
+Move generation for many positions at once, using NumPy.
+
+Positions are given as an N x 64 array of piece codes, one row per position, using the same codes
+as Board.pack: 0 for an empty square, 1 to 6 for a white pawn, knight, bishop, rook, queen or king,
+and 9 to 14 for the black pieces. Alongside it goes an array of N booleans saying whether black is
+to move. from_boards and from_packed build both arrays.
+
+Every position is converted to bitboards and all positions are moved together, one direction at a
+time, so the cost barely depends on how many positions there are. The rules are the same as
+Piece.get_available_moves: moves are not checked for leaving the king in check, and pawns on the
+first and last rows cannot move.
+
+NumPy is an optional dependency: install the ``batch`` extra to use this module.
+"""
+import numpy as np
+
+from chessington.engine.bitboards import BOARD_SIZE, PAWN_ROWS
+
+_BLACK = 8
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(6)
+
+_SQUARE_BITS = np.left_shift(np.uint64(1), np.arange(BOARD_SIZE * BOARD_SIZE, dtype=np.uint64))
+
+_FILE_A = 0x0101010101010101
+_NOT_A = np.uint64(~_FILE_A & 0xFFFFFFFFFFFFFFFF)
+_NOT_H = np.uint64(~(_FILE_A << 7) & 0xFFFFFFFFFFFFFFFF)
+_NOT_AB = np.uint64(~(_FILE_A | _FILE_A << 1) & 0xFFFFFFFFFFFFFFFF)
+_NOT_GH = np.uint64(~(_FILE_A << 6 | _FILE_A << 7) & 0xFFFFFFFFFFFFFFFF)
+_ALL = np.uint64(0xFFFFFFFFFFFFFFFF)
+_PAWN_ROWS = np.uint64(PAWN_ROWS)
+# The rows pawns land on with a single step from their starting rows
+_ROW_2 = np.uint64(0xFF << 16)
+_ROW_5 = np.uint64(0xFF << 40)
+
+# Steps as (bit shift, mask of squares that can be landed on without wrapping round the board)
+_ORTHOGONAL = ((8, _ALL), (-8, _ALL), (1, _NOT_A), (-1, _NOT_H))
+_DIAGONAL = ((9, _NOT_A), (7, _NOT_H), (-7, _NOT_A), (-9, _NOT_H))
+_KNIGHT_JUMPS = (
+    (17, _NOT_A), (15, _NOT_H), (10, _NOT_AB), (6, _NOT_GH),
+    (-6, _NOT_AB), (-10, _NOT_GH), (-15, _NOT_A), (-17, _NOT_H),
+)
+
+
+def _shift(bitboards, amount):
+    if amount > 0:
+        return np.left_shift(bitboards, np.uint64(amount))
+    return np.right_shift(bitboards, np.uint64(-amount))
+
+
+if hasattr(np, 'bitwise_count'):
+    def _popcount(bitboards):
+        return np.bitwise_count(bitboards).astype(np.int64)
+else:
+    _BYTE_COUNTS = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.int64)
+
+    def _popcount(bitboards):
+        return _BYTE_COUNTS[bitboards.view(np.uint8)].reshape(bitboards.shape + (8,)).sum(axis=-1)
+
+
+def from_packed(packed):
+    """
+    Unpacks an N x 33 array of positions packed by Board.pack into piece codes and an array saying
+    whether black is to move.
+    """
+    packed = np.asarray(packed, dtype=np.uint8)
+    squares = packed[:, :BOARD_SIZE * BOARD_SIZE // 2]
+    codes = np.empty((len(packed), BOARD_SIZE * BOARD_SIZE), dtype=np.int8)
+    codes[:, 0::2] = squares & 0xF
+    codes[:, 1::2] = squares >> 4
+    return codes, (packed[:, -1] & 1).astype(bool)
+
+
+def from_boards(boards):
+    """
+    Converts a sequence of boards into piece codes and an array saying whether black is to move.
+    """
+    data = b''.join(board.pack() for board in boards)
+    return from_packed(np.frombuffer(data, dtype=np.uint8).reshape(len(boards), -1))
+
+
+def to_bitboards(codes):
+    """
+    Converts an N x 64 array of piece codes into an N x 12 array of bitboards: the white pawns,
+    knights, bishops, rooks, queens and king, then the same for black.
+    """
+    codes = np.asarray(codes)
+    bitboards = np.empty((len(codes), 12), dtype=np.uint64)
+    for piece in range(6):
+        for colour in (0, 1):
+            on_square = codes == piece + 1 + colour * _BLACK
+            bitboards[:, colour * 6 + piece] = np.bitwise_or.reduce(np.where(on_square, _SQUARE_BITS, np.uint64(0)), axis=1)
+    return bitboards
+
+
+def _sides(codes, black_to_move):
+    """
+    Splits the bitboards into those of the player to move and those of their opponent.
+    """
+    bitboards = to_bitboards(codes)
+    black_to_move = np.asarray(black_to_move, dtype=bool)[:, None]
+    own = np.where(black_to_move, bitboards[:, 6:], bitboards[:, :6])
+    enemy = np.where(black_to_move, bitboards[:, :6], bitboards[:, 6:])
+    return own, enemy, black_to_move[:, 0]
+
+
+def _slide(sliders, empty, amount, landing):
+    """
+    The squares sliding pieces can reach in one direction, up to and including the first occupied
+    square, by an occluded fill.
+    """
+    passable = empty & landing
+    filled = sliders
+    for step in (amount, 2 * amount, 4 * amount):
+        filled = filled | passable & _shift(filled, step)
+        passable = passable & _shift(passable, step)
+    return _shift(filled, amount) & landing
+
+
+def _destinations(codes, black_to_move):
+    """
+    Yields bitboards of destination squares for the player to move, such that the number of moves
+    is the sum of their popcounts: within each one, no two moves share a destination.
+    """
+    own, enemy, black = _sides(codes, black_to_move)
+    own_occupancy = np.bitwise_or.reduce(own, axis=1)
+    enemy_occupancy = np.bitwise_or.reduce(enemy, axis=1)
+    empty = ~(own_occupancy | enemy_occupancy)
+    targets = ~own_occupancy
+
+    # Pawns, moving up the board for white and down for black
+    pawns = own[:, PAWN] & _PAWN_ROWS
+    single = np.where(black, _shift(pawns, -8), _shift(pawns, 8)) & empty
+    yield single
+    double_row = np.where(black, _ROW_5, _ROW_2)
+    yield np.where(black, _shift(single & double_row, -8), _shift(single & double_row, 8)) & empty
+    for amount, landing in ((1, _NOT_A), (-1, _NOT_H)):
+        up, down = _shift(pawns, 8 + amount), _shift(pawns, -8 + amount)
+        yield np.where(black, down, up) & landing & enemy_occupancy
+
+    for amount, landing in _KNIGHT_JUMPS:
+        yield _shift(own[:, KNIGHT], amount) & landing & targets
+    for amount, landing in _ORTHOGONAL + _DIAGONAL:
+        yield _shift(own[:, KING], amount) & landing & targets
+
+    orthogonal = own[:, ROOK] | own[:, QUEEN]
+    diagonal = own[:, BISHOP] | own[:, QUEEN]
+    for amount, landing in _ORTHOGONAL:
+        yield _slide(orthogonal, empty, amount, landing) & targets
+    for amount, landing in _DIAGONAL:
+        yield _slide(diagonal, empty, amount, landing) & targets
+
+
+def count_moves(codes, black_to_move):
+    """
+    Counts the moves available to the player to move in each position.
+    """
+    return sum(_popcount(destinations) for destinations in _destinations(codes, black_to_move))
+
+
+def move_masks(codes, black_to_move):
+    """
+    A bitboard, for each position, of the squares the player to move can move a piece to.
+    """
+    masks = np.zeros(len(codes), dtype=np.uint64)
+    for destinations in _destinations(codes, black_to_move):
+        masks |= destinations
+    return masks
@@ -0,0 +1,211 @@
+"""
+Helpers for working with bitboards - 64-bit integers holding one bit per square of the board.
+
+Bit n of a bitboard corresponds to the square on row n // 8 and column n % 8, so bit 0 is the
+bottom left square and bit 63 is the top right square.
+"""
+
+BOARD_SIZE = 8
+
+EMPTY = 0
+FULL = (1 << 64) - 1
+
+
+def square_mask(row, col):
+    """
+    A bitboard with only the given square set.
+    """
+    return 1 << (row * BOARD_SIZE + col)
+
+
+def iter_indices(mask):
+    """
+    Yields the index of every set bit in the bitboard, lowest first.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+def popcount(mask):
+    """
+    The number of squares set in the bitboard.
+    """
+    return bin(mask).count('1')
+
+
+def _leaper_moves(offsets):
+    """
+    Builds a table, indexed by square, of the squares reachable with a single step by one of the
+    given (row, column) offsets without leaving the board.
+    """
+    table = []
+    for index in range(BOARD_SIZE * BOARD_SIZE):
+        row, col = divmod(index, BOARD_SIZE)
+        mask = EMPTY
+        for row_offset, col_offset in offsets:
+            target_row, target_col = row + row_offset, col + col_offset
+            if 0 <= target_row < BOARD_SIZE and 0 <= target_col < BOARD_SIZE:
+                mask |= square_mask(target_row, target_col)
+        table.append(mask)
+    return tuple(table)
+
+
+KING_MOVES = _leaper_moves([(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)])
+KNIGHT_MOVES = _leaper_moves([(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)])
+
+# Pawn captures, keyed by the direction the pawn moves in (1 for up the board, -1 for down)
+PAWN_ATTACKS = {
+    1: _leaper_moves([(1, -1), (1, 1)]),
+    -1: _leaper_moves([(-1, -1), (-1, 1)]),
+}
+
+
+def lowest_index(mask):
+    """
+    The index of the lowest set bit of a non-empty bitboard.
+    """
+    return (mask & -mask).bit_length() - 1
+
+
+def highest_index(mask):
+    """
+    The index of the highest set bit of a non-empty bitboard.
+    """
+    return mask.bit_length() - 1
+
+
+def _rays(row_step, col_step):
+    """
+    Builds a table, indexed by square, of the squares reached by sliding in the given direction
+    from that square to the edge of the board (not including the square itself).
+    """
+    table = []
+    for index in range(BOARD_SIZE * BOARD_SIZE):
+        row, col = divmod(index, BOARD_SIZE)
+        mask = EMPTY
+        row, col = row + row_step, col + col_step
+        while 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+            mask |= square_mask(row, col)
+            row, col = row + row_step, col + col_step
+        table.append(mask)
+    return tuple(table)
+
+
+# Rays in each direction. Rays in the "positive" directions run towards higher bit indices, so the
+# nearest piece along them is the lowest set bit; along "negative" rays it is the highest set bit.
+NORTH, SOUTH, EAST, WEST = _rays(1, 0), _rays(-1, 0), _rays(0, 1), _rays(0, -1)
+NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST = _rays(1, 1), _rays(1, -1), _rays(-1, 1), _rays(-1, -1)
+
+ROOK_RAYS = ((NORTH, EAST), (SOUTH, WEST))
+BISHOP_RAYS = ((NORTH_EAST, NORTH_WEST), (SOUTH_EAST, SOUTH_WEST))
+
+
+def slide(index, occupied, rays):
+    """
+    The squares a sliding piece on the given square can reach along the given (positive,
+    negative) rays, stopping at and including the first occupied square in each direction.
+    """
+    positive_rays, negative_rays = rays
+    moves = EMPTY
+    for ray in positive_rays:
+        moves |= ray[index]
+        blockers = ray[index] & occupied
+        if blockers:
+            moves &= ~ray[lowest_index(blockers)]
+    for ray in negative_rays:
+        moves |= ray[index]
+        blockers = ray[index] & occupied
+        if blockers:
+            moves &= ~ray[highest_index(blockers)]
+    return moves
+
+
+def _relevant_occupancy(index, rays):
+    """
+    The squares whose occupancy can affect a sliding piece's moves from the given square: every
+    square along its rays except the last one on each, since nothing lies beyond it.
+    """
+    positive_rays, negative_rays = rays
+    mask = EMPTY
+    for ray in positive_rays:
+        if ray[index]:
+            mask |= ray[index] & ~(1 << highest_index(ray[index]))
+    for ray in negative_rays:
+        if ray[index]:
+            mask |= ray[index] & ~(1 << lowest_index(ray[index]))
+    return mask
+
+
+def _attack_table(index, relevant, rays):
+    """
+    Builds a dictionary from every subset of the relevant occupancy to the resulting moves.
+
+    This plays the part of a magic bitboard table, with Python's dictionary hashing standing in
+    for the magic multiplication.
+    """
+    table = {}
+    subset = EMPTY
+    while True:
+        table[subset] = slide(index, subset, rays)
+        subset = (subset - relevant) & relevant
+        if subset == EMPTY:
+            return table
+
+
+ROOK_OCCUPANCY = tuple(_relevant_occupancy(index, ROOK_RAYS) for index in range(BOARD_SIZE * BOARD_SIZE))
+BISHOP_OCCUPANCY = tuple(_relevant_occupancy(index, BISHOP_RAYS) for index in range(BOARD_SIZE * BOARD_SIZE))
+
+# Built lazily, one square at a time, as the full tables take a noticeable time to create
+_ROOK_TABLES = [None] * (BOARD_SIZE * BOARD_SIZE)
+_BISHOP_TABLES = [None] * (BOARD_SIZE * BOARD_SIZE)
+
+
+def rook_moves(index, occupied):
+    """
+    The squares a rook on the given square can reach, up to and including the first occupied
+    square in each direction.
+    """
+    table = _ROOK_TABLES[index]
+    if table is None:
+        table = _ROOK_TABLES[index] = _attack_table(index, ROOK_OCCUPANCY[index], ROOK_RAYS)
+    return table[occupied & ROOK_OCCUPANCY[index]]
+
+
+def bishop_moves(index, occupied):
+    """
+    The squares a bishop on the given square can reach, up to and including the first occupied
+    square in each direction.
+    """
+    table = _BISHOP_TABLES[index]
+    if table is None:
+        table = _BISHOP_TABLES[index] = _attack_table(index, BISHOP_OCCUPANCY[index], BISHOP_RAYS)
+    return table[occupied & BISHOP_OCCUPANCY[index]]
+
+
+def queen_moves(index, occupied):
+    """
+    The squares a queen on the given square can reach, up to and including the first occupied
+    square in each direction.
+    """
+    return rook_moves(index, occupied) | bishop_moves(index, occupied)
+
+
+def _between():
+    """
+    Builds a table giving, for each pair of squares on a shared row, column or diagonal, the
+    squares strictly between them.
+    """
+    table = [[EMPTY] * (BOARD_SIZE * BOARD_SIZE) for _ in range(BOARD_SIZE * BOARD_SIZE)]
+    for rays in (NORTH, SOUTH, EAST, WEST, NORTH_EAST, NORTH_WEST, SOUTH_EAST, SOUTH_WEST):
+        for start in range(BOARD_SIZE * BOARD_SIZE):
+            for end in iter_indices(rays[start]):
+                table[start][end] = rays[start] & ~rays[end] & ~(1 << end)
+    return tuple(tuple(row) for row in table)
+
+
+BETWEEN = _between()
+
+# Pawns on the first and last rows cannot move, so don't attack anything either
+PAWN_ROWS = FULL & ~0xFF & ~(0xFF << 56)
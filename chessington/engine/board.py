@@ -1,21 +1,79 @@
 """
-A module providing a representation of a chess board. The rules of chess are not implemented - 
-this is just a "dumb" board that will let you move pieces around as you like.
+A module providing a representation of a chess board, which generates legal moves and detects
+check, checkmate, stalemate and draws by repetition or the fifty-move rule.
+
+Castling, en passant and promotion are not implemented. move_piece only checks that the piece
+being moved belongs to the player whose turn it is, not that the move is legal: callers that need
+that should check the move against get_legal_moves first.
 """
 
-from chessington.engine.data import Player, Square
-from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+from chessington.engine.bitboards import (
+    BETWEEN, BOARD_SIZE, FULL, KING_MOVES, KNIGHT_MOVES, PAWN_ATTACKS, PAWN_ROWS,
+    bishop_moves, iter_indices, lowest_index, rook_moves,
+)
+from chessington.engine.data import Player, Square, SQUARES
+from chessington.engine.evaluation import SQUARE_SCORES
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King, PIECE_TYPES
+from chessington.engine.zobrist import BLACK_TO_MOVE, PIECE_KEYS
+
+# Codes for packing positions: four bits per square, with the top bit set for black pieces
+_BLACK_CODE = 8
+_PIECE_CODES = {
+    (player, piece_type): code + (_BLACK_CODE if player == Player.BLACK else 0)
+    for player in Player
+    for code, piece_type in enumerate(PIECE_TYPES, start=1)
+}
+_PIECES_BY_CODE = {code: piece for piece, code in _PIECE_CODES.items()}
+
+_PIECES_BY_LETTER = {'p': Pawn, 'n': Knight, 'b': Bishop, 'r': Rook, 'q': Queen, 'k': King}
+_LETTERS_BY_PIECE = {piece_type: letter for letter, piece_type in _PIECES_BY_LETTER.items()}
+
+PACKED_SIZE = BOARD_SIZE * BOARD_SIZE // 2 + 1
 
-BOARD_SIZE = 8
+def _index_of(square):
+    # Squares off the board would otherwise alias squares on it through their index
+    if not (0 <= square.row < BOARD_SIZE and 0 <= square.col < BOARD_SIZE):
+        raise IndexError(f'Square is off the board: {square}')
+    return square.index
 
 class Board:
     """
     A representation of the chess board, and the pieces on it.
+
+    Pieces are stored in a flat list of 64 squares, alongside a bitboard of occupied squares for
+    each player and each type of piece so that move generation can work with whole sets of squares
+    at once. An index from each piece to its square is kept in step, so pieces can be found without
+    searching the board.
+
+    The board also remembers the key of every position since the last pawn move or capture, along
+    with how many moves have been made since then, so draws by repetition and by the fifty-move
+    rule can be spotted without replaying the game.
     """
 
+    __slots__ = (
+        '_current_player', '_zobrist_key', '_piece_square_score', '_squares', '_occupancy',
+        '_bitboards', '_locations', '_undo_stack', '_attack_maps', '_key_history', '_halfmove_clock',
+        '_fullmove_number',
+    )
+
     def __init__(self, player, board_state):
-        self.current_player = Player.WHITE
-        self.board = board_state
+        self._current_player = Player.WHITE
+        self._zobrist_key = 0
+        self._piece_square_score = 0
+        self._squares = [None] * (BOARD_SIZE * BOARD_SIZE)
+        self._occupancy = {Player.WHITE: 0, Player.BLACK: 0}
+        self._bitboards = {(owner, piece_type): 0 for owner in Player for piece_type in PIECE_TYPES}
+        self._locations = {Player.WHITE: {}, Player.BLACK: {}}
+        self._undo_stack = []
+        self._attack_maps = (None, None)
+        self._key_history = []
+        self._halfmove_clock = 0
+        self._fullmove_number = 1
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                if board_state[row][col] is not None:
+                    self.set_piece(Square.at(row, col), board_state[row][col])
+        self.current_player = player
 
     @staticmethod
     def empty():
@@ -25,6 +83,97 @@ class Board:
     def at_starting_position():
         return Board(Player.WHITE, Board._create_starting_board())
 
+    @staticmethod
+    def from_fen(fen):
+        """
+        Sets up a board from a position in Forsyth-Edwards Notation.
+
+        Castling rights and en passant squares are ignored, as the board doesn't support them.
+        """
+        fields = fen.split()
+        if not fields:
+            raise ValueError(f'Empty FEN: {fen!r}')
+        board_state = Board._create_empty_board()
+        ranks = fields[0].split('/')
+        if len(ranks) != BOARD_SIZE:
+            raise ValueError(f'Expected {BOARD_SIZE} ranks in FEN: {fen}')
+        for rank_number, rank in enumerate(ranks):
+            row, col = BOARD_SIZE - 1 - rank_number, 0
+            for letter in rank:
+                if letter.isdigit():
+                    col += int(letter)
+                elif letter.lower() in _PIECES_BY_LETTER and col < BOARD_SIZE:
+                    player = Player.WHITE if letter.isupper() else Player.BLACK
+                    board_state[row][col] = _PIECES_BY_LETTER[letter.lower()](player)
+                    col += 1
+                else:
+                    raise ValueError(f'Invalid rank {rank!r} in FEN: {fen}')
+            if col != BOARD_SIZE:
+                raise ValueError(f'Invalid rank {rank!r} in FEN: {fen}')
+
+        player = Player.BLACK if len(fields) > 1 and fields[1] == 'b' else Player.WHITE
+        board = Board(player, board_state)
+        if len(fields) > 5:
+            if not (fields[4].isdigit() and fields[5].isdigit()):
+                raise ValueError(f'Invalid move counters in FEN: {fen}')
+            board._halfmove_clock = int(fields[4])
+            board._fullmove_number = max(int(fields[5]), 1)
+        return board
+
+    @staticmethod
+    def unpack(data, halfmove_clock=0, history=()):
+        """
+        Recreates a board from the bytes produced by pack, filling in its storage directly.
+
+        The packed position has no history, so the halfmove clock and the keys from
+        repetition_history can be passed along with it for draws to be detected.
+        """
+        board = Board.empty()
+        squares, occupancy, bitboards, locations = board._squares, board._occupancy, board._bitboards, board._locations
+        zobrist_key, score = 0, 0
+        for index in range(BOARD_SIZE * BOARD_SIZE):
+            code = data[index >> 1] >> ((index & 1) << 2) & 0xF
+            if code:
+                kind = _PIECES_BY_CODE[code]
+                player, piece_type = kind
+                piece = piece_type(player)
+                mask = 1 << index
+                squares[index] = piece
+                occupancy[player] |= mask
+                bitboards[kind] |= mask
+                locations[player][piece] = SQUARES[index]
+                zobrist_key ^= PIECE_KEYS[kind][index]
+                score += SQUARE_SCORES[kind][index]
+        board._zobrist_key = zobrist_key
+        board._piece_square_score = score
+        if data[-1] & 1:
+            board.current_player = Player.BLACK
+        board._halfmove_clock = halfmove_clock
+        board._key_history = list(history)
+        return board
+
+    def copy(self):
+        """
+        Makes an independent copy of the board, which can be moved on without affecting this one.
+
+        Only the board's own storage is copied: pieces hold nothing that changes as they move, so
+        both boards share the same piece objects.
+        """
+        board = Board.__new__(Board)
+        board._current_player = self._current_player
+        board._zobrist_key = self._zobrist_key
+        board._piece_square_score = self._piece_square_score
+        board._squares = self._squares.copy()
+        board._occupancy = self._occupancy.copy()
+        board._bitboards = self._bitboards.copy()
+        board._locations = {player: locations.copy() for player, locations in self._locations.items()}
+        board._undo_stack = self._undo_stack.copy()
+        board._attack_maps = (None, None)
+        board._key_history = self._key_history.copy()
+        board._halfmove_clock = self._halfmove_clock
+        board._fullmove_number = self._fullmove_number
+        return board
+
     @staticmethod
     def _create_empty_board():
         return [[None] * BOARD_SIZE for _ in range(BOARD_SIZE)]
@@ -46,27 +195,324 @@ class Board:
 
         return board
 
+    @property
+    def current_player(self):
+        """
+        The player whose turn it is.
+        """
+        return self._current_player
+
+    @current_player.setter
+    def current_player(self, player):
+        if player != self._current_player:
+            self._zobrist_key ^= BLACK_TO_MOVE
+        self._current_player = player
+
+    @property
+    def zobrist_key(self):
+        """
+        A 64-bit hash of the position: the pieces on the board and the player to move.
+        """
+        return self._zobrist_key
+
+    @property
+    def piece_square_score(self):
+        """
+        The material and piece-square score of the pieces on the board, positive when it favours
+        white and negative when it favours black.
+        """
+        return self._piece_square_score
+
+    @property
+    def halfmove_clock(self):
+        """
+        The number of moves made since the last pawn move or capture.
+        """
+        return self._halfmove_clock
+
+    @property
+    def fullmove_number(self):
+        """
+        The number of the current move, starting at 1 and going up after each of black's moves.
+        """
+        return self._fullmove_number
+
+    @property
+    def board(self):
+        """
+        The pieces on the board as a list of rows, each a list of squares.
+        """
+        return [self._squares[row * BOARD_SIZE:(row + 1) * BOARD_SIZE] for row in range(BOARD_SIZE)]
+
+    def to_fen(self):
+        """
+        Describes the position in Forsyth-Edwards Notation.
+        """
+        ranks = []
+        for row in reversed(range(BOARD_SIZE)):
+            rank, empty = '', 0
+            for piece in self._squares[row * BOARD_SIZE:(row + 1) * BOARD_SIZE]:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    rank, empty = rank + str(empty), 0
+                letter = _LETTERS_BY_PIECE[type(piece)]
+                rank += letter.upper() if piece.player == Player.WHITE else letter
+            ranks.append(rank + (str(empty) if empty else ''))
+        side = 'w' if self.current_player == Player.WHITE else 'b'
+        return f'{"/".join(ranks)} {side} - - {self._halfmove_clock} {self._fullmove_number}'
+
+    def pack(self):
+        """
+        Packs the position into PACKED_SIZE bytes: four bits per square for the piece on it, then a
+        byte of flags recording the player to move.
+
+        This is much smaller and quicker to send between processes than the board itself.
+        """
+        data = bytearray(PACKED_SIZE)
+        for index, piece in enumerate(self._squares):
+            if piece is not None:
+                data[index // 2] |= _PIECE_CODES[piece.player, type(piece)] << (4 * (index % 2))
+        data[-1] = 1 if self.current_player == Player.BLACK else 0
+        return bytes(data)
+
     def set_piece(self, square, piece):
         """
         Places the piece at the given position on the board.
         """
-        self.board[square.row][square.col] = piece
+        index = _index_of(square)
+        mask = 1 << index
+
+        existing_piece = self._squares[index]
+        if existing_piece is not None:
+            self._occupancy[existing_piece.player] &= ~mask
+            self._bitboards[existing_piece.player, type(existing_piece)] &= ~mask
+            self._zobrist_key ^= PIECE_KEYS[existing_piece.player, type(existing_piece)][index]
+            self._piece_square_score -= SQUARE_SCORES[existing_piece.player, type(existing_piece)][index]
+            locations = self._locations[existing_piece.player]
+            # The piece may already have been placed on its new square when moving
+            if locations.get(existing_piece) == square:
+                del locations[existing_piece]
+
+        self._squares[index] = piece
+        if piece is not None:
+            self._occupancy[piece.player] |= mask
+            self._bitboards[piece.player, type(piece)] |= mask
+            self._zobrist_key ^= PIECE_KEYS[piece.player, type(piece)][index]
+            self._piece_square_score += SQUARE_SCORES[piece.player, type(piece)][index]
+            self._locations[piece.player][piece] = SQUARES[index]
 
     def get_piece(self, square):
         """
         Retrieves the piece from the given square of the board.
         """
-        return self.board[square.row][square.col]
+        return self._squares[_index_of(square)]
+
+    def get_occupancy(self, player=None):
+        """
+        A bitboard of the squares occupied by the given player's pieces, or by any piece if no
+        player is given.
+        """
+        if player is None:
+            return self._occupancy[Player.WHITE] | self._occupancy[Player.BLACK]
+        return self._occupancy[player]
+
+    def get_bitboard(self, piece_type, player):
+        """
+        A bitboard of the squares occupied by the given player's pieces of the given type.
+        """
+        return self._bitboards[player, piece_type]
+
+    def get_pieces(self, player):
+        """
+        Lists all of the given player's pieces that are on the board.
+        """
+        return list(self._locations[player])
+
+    def get_moves(self):
+        """
+        Lists every move available to the current player, as (from_square, to_square) pairs.
+
+        Moves are not checked for leaving the player's king in check; see get_legal_moves.
+        """
+        moves = []
+        for piece, square in self._locations[self.current_player].items():
+            for index in iter_indices(piece.get_move_mask(self, square)):
+                moves.append((square, SQUARES[index]))
+        return moves
+
+    def get_legal_moves(self):
+        """
+        Lists every move available to the current player that doesn't leave their king in check.
+
+        Rather than trying each move and looking for attacks on the king, the moves of each piece
+        are restricted up front: the king avoids attacked squares, other pieces must capture or
+        block a single checking piece, and pinned pieces must stay between the king and the pinner.
+        """
+        player = self.current_player
+        enemy = player.opponent()
+        king_mask = self._bitboards[player, King]
+        if not king_mask:
+            return self.get_moves()
+
+        king_index = lowest_index(king_mask)
+        king_square = SQUARES[king_index]
+        occupied = self._occupancy[Player.WHITE] | self._occupancy[Player.BLACK]
+        own = self._occupancy[player]
+
+        # Sliding pieces attack straight through the king, so it can't step back along their line
+        danger = self._attack_map(enemy, occupied & ~king_mask)
+        moves = [(king_square, SQUARES[index]) for index in iter_indices(KING_MOVES[king_index] & ~own & ~danger)]
+
+        checkers = self.get_attackers(king_square, enemy)
+        if checkers & (checkers - 1):
+            # Only the king can escape from a double check
+            return moves
+
+        targets = FULL & ~own
+        if checkers:
+            targets &= checkers | BETWEEN[king_index][lowest_index(checkers)]
+
+        pins = self._pins(king_index, player, occupied)
+        for piece, square in self._locations[player].items():
+            if square.index == king_index:
+                continue
+            mask = piece.get_move_mask(self, square) & targets
+            if square.index in pins:
+                mask &= pins[square.index]
+            for index in iter_indices(mask):
+                moves.append((square, SQUARES[index]))
+        return moves
+
+    def _pins(self, king_index, player, occupied):
+        """
+        Finds the player's pieces that are pinned to their king, as a dictionary from each pinned
+        piece's square index to the squares it can stay on.
+        """
+        enemy = player.opponent()
+        enemy_occupancy = self._occupancy[enemy]
+        queens = self._bitboards[enemy, Queen]
+        pinners = (rook_moves(king_index, enemy_occupancy) & (self._bitboards[enemy, Rook] | queens)
+                   | bishop_moves(king_index, enemy_occupancy) & (self._bitboards[enemy, Bishop] | queens))
+
+        pins = {}
+        for pinner in iter_indices(pinners):
+            between = BETWEEN[king_index][pinner] & occupied
+            if between and not between & (between - 1) and between & self._occupancy[player]:
+                pins[lowest_index(between)] = BETWEEN[king_index][pinner] | 1 << pinner
+        return pins
+
+    def get_attackers(self, square, player):
+        """
+        A bitboard of the given player's pieces that attack the given square.
+        """
+        index = square.index
+        occupied = self._occupancy[Player.WHITE] | self._occupancy[Player.BLACK]
+        bitboards = self._bitboards
+        queens = bitboards[player, Queen]
+        pawn_direction = -1 if player == Player.WHITE else 1
+        return (KNIGHT_MOVES[index] & bitboards[player, Knight]
+                | KING_MOVES[index] & bitboards[player, King]
+                | PAWN_ATTACKS[pawn_direction][index] & bitboards[player, Pawn] & PAWN_ROWS
+                | rook_moves(index, occupied) & (bitboards[player, Rook] | queens)
+                | bishop_moves(index, occupied) & (bitboards[player, Bishop] | queens))
+
+    def get_attack_map(self, player):
+        """
+        A bitboard of every square attacked by the given player's pieces.
+        """
+        key = self._zobrist_key
+        if self._attack_maps[0] != key:
+            self._attack_maps = (key, {})
+        attack_maps = self._attack_maps[1]
+        if player not in attack_maps:
+            attack_maps[player] = self._attack_map(player, self.get_occupancy())
+        return attack_maps[player]
+
+    def _attack_map(self, player, occupied):
+        bitboards = self._bitboards
+        attacks = 0
+        for index in iter_indices(bitboards[player, Knight]):
+            attacks |= KNIGHT_MOVES[index]
+        for index in iter_indices(bitboards[player, King]):
+            attacks |= KING_MOVES[index]
+        pawn_direction = 1 if player == Player.WHITE else -1
+        for index in iter_indices(bitboards[player, Pawn] & PAWN_ROWS):
+            attacks |= PAWN_ATTACKS[pawn_direction][index]
+        queens = bitboards[player, Queen]
+        for index in iter_indices(bitboards[player, Rook] | queens):
+            attacks |= rook_moves(index, occupied)
+        for index in iter_indices(bitboards[player, Bishop] | queens):
+            attacks |= bishop_moves(index, occupied)
+        return attacks
+
+    def is_in_check(self):
+        """
+        Whether the current player's king is attacked.
+        """
+        king_mask = self._bitboards[self.current_player, King]
+        return bool(king_mask) and bool(king_mask & self.get_attack_map(self.current_player.opponent()))
+
+    def is_checkmate(self):
+        """
+        Whether the current player is in check and has no legal moves.
+        """
+        return self.is_in_check() and not self.get_legal_moves()
+
+    def is_stalemate(self):
+        """
+        Whether the current player is not in check but has no legal moves.
+        """
+        return not self.is_in_check() and not self.get_legal_moves()
+
+    def repetition_history(self):
+        """
+        The keys of the positions since the last pawn move or capture, oldest first: the only ones
+        that can be repeated.
+        """
+        return self._key_history[max(len(self._key_history) - self._halfmove_clock, 0):]
+
+    def is_repetition(self):
+        """
+        Whether the current position has occurred before, with the same player to move.
+
+        Only positions since the last pawn move or capture are checked, as no earlier position can
+        come round again.
+        """
+        return self._repetitions(1)
+
+    def is_threefold_repetition(self):
+        """
+        Whether the current position has occurred at least twice before, which is a draw.
+        """
+        return self._repetitions(2)
+
+    def _repetitions(self, count):
+        history = self._key_history
+        key = self._zobrist_key
+        earliest = max(len(history) - self._halfmove_clock, 0)
+        for index in range(len(history) - 2, earliest - 1, -2):
+            if history[index] == key:
+                count -= 1
+                if count == 0:
+                    return True
+        return False
+
+    def is_fifty_move_draw(self):
+        """
+        Whether fifty moves by each player have been made without a pawn move or capture.
+        """
+        return self._halfmove_clock >= 100
 
     def find_piece(self, piece_to_find):
         """
-        Searches for the given piece on the board and returns its square.
+        Looks up the square that the given piece is on.
         """
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                if self.board[row][col] is piece_to_find:
-                    return Square.at(row, col)
-        raise Exception('The supplied piece is not on the board')
+        square = self._locations[piece_to_find.player].get(piece_to_find)
+        if square is None:
+            raise Exception('The supplied piece is not on the board')
+        return square
 
     def move_piece(self, from_square, to_square):
         """
@@ -74,6 +520,41 @@ class Board:
         """
         moving_piece = self.get_piece(from_square)
         if moving_piece is not None and moving_piece.player == self.current_player:
-            self.set_piece(to_square, moving_piece)
-            self.set_piece(from_square, None)
-            self.current_player = self.current_player.opponent()
+            self.make_move(from_square, to_square)
+
+    def make_move(self, from_square, to_square):
+        """
+        Moves the piece on the starting square to the destination square and hands the turn to the
+        other player, remembering enough to reverse the move with unmake_move.
+
+        Unlike move_piece, this does not check that there is a piece of the current player's to move.
+        """
+        moving_piece = self._squares[from_square.index]
+        captured_piece = self._squares[to_square.index]
+        player = self.current_player
+        self._undo_stack.append((from_square, to_square, moving_piece, captured_piece, player, self._halfmove_clock))
+        self._key_history.append(self._zobrist_key)
+
+        if captured_piece is not None or type(moving_piece) is Pawn:
+            self._halfmove_clock = 0
+        else:
+            self._halfmove_clock += 1
+        if player == Player.BLACK:
+            self._fullmove_number += 1
+
+        self.set_piece(to_square, moving_piece)
+        self.set_piece(from_square, None)
+        self.current_player = player.opponent()
+
+    def unmake_move(self):
+        """
+        Reverses the most recent move, restoring any captured piece and the player to move.
+        """
+        from_square, to_square, moving_piece, captured_piece, player, halfmove_clock = self._undo_stack.pop()
+        self._key_history.pop()
+        self._halfmove_clock = halfmove_clock
+        if player == Player.BLACK:
+            self._fullmove_number -= 1
+        self.set_piece(from_square, moving_piece)
+        self.set_piece(to_square, captured_piece)
+        self.current_player = player
@@ -1,9 +1,11 @@
 """
 Data classes for easy representation of concepts such as a square on the board or a player.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
 
+from chessington.engine.bitboards import BOARD_SIZE, iter_indices
+
 class Player(Enum):
     """
     The two players in a game of chess.
@@ -16,17 +18,75 @@ class Player(Enum):
         else: return Player.WHITE
 
 
+FILE_NAMES = 'abcdefgh'
+
+
 @dataclass(frozen=True)
 class Square:
+    """
+    A square on the board, identified by its row and column.
+
+    Squares on the board are interned: Square.at and Square.from_index hand out shared instances
+    from SQUARES rather than allocating new ones, and each square carries its bit index (0-63).
+    """
     row: int
     col: int
+    index: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'index', self.row * BOARD_SIZE + self.col)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.row == other.row and self.col == other.col
+
+    def __hash__(self):
+        return self.index
 
     @classmethod
     def at(cls, row: int, col: int):
         """
         Provides backward compatibility with previous namedtuple implementation.
 
-        Square.at(...) is equivalent to Square(...).
+        Square.at(...) is equivalent to Square(...), but returns the shared instance for squares
+        that are on the board.
         """
-
+        if 0 <= row < BOARD_SIZE and 0 <= col < BOARD_SIZE:
+            return SQUARES[row * BOARD_SIZE + col]
         return cls(row=row, col=col)
+
+    @property
+    def name(self):
+        """
+        The algebraic name of the square, e.g. 'e4'.
+        """
+        return FILE_NAMES[self.col] + str(self.row + 1)
+
+    @staticmethod
+    def from_name(name: str):
+        """
+        The shared instance of the square with the given algebraic name, e.g. 'e4'.
+        """
+        if len(name) != 2 or name[0] not in FILE_NAMES or name[1] not in '12345678':
+            raise ValueError(f'Not a square: {name!r}')
+        return SQUARES[(int(name[1]) - 1) * BOARD_SIZE + FILE_NAMES.index(name[0])]
+
+    @staticmethod
+    def from_index(index: int):
+        """
+        The shared instance of the square with the given bit index.
+        """
+        return SQUARES[index]
+
+
+SQUARES = tuple(Square(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE))
+
+
+def squares_in(mask):
+    """
+    Lists the shared squares set in the given bitboard, lowest index first.
+    """
+    return [SQUARES[index] for index in iter_indices(mask)]
@@ -0,0 +1,181 @@
+"""
+Static evaluation of positions, for the search to score the positions at the end of its lines.
+
+Material and piece-square scores are kept up to date by the board as pieces are placed and
+removed, so reading them costs nothing. Pawn structure is worked out from the pawn bitboards and
+cached, as the pawns change far less often than the rest of the position.
+"""
+from chessington.engine.bitboards import BOARD_SIZE, popcount
+from chessington.engine.data import Player
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+PIECE_VALUES = {Pawn: 100, Knight: 320, Bishop: 330, Rook: 500, Queen: 900, King: 20000}
+
+# Piece-square tables from white's point of view, laid out as seen from white's side of the board:
+# the first line is the far (eighth) rank and the last line is white's back rank.
+_PIECE_SQUARE_TABLES = {
+    Pawn: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ],
+    Knight: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ],
+    Bishop: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ],
+    Rook: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ],
+    Queen: [
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ],
+    King: [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ],
+}
+
+
+def _square_scores(piece_type, player):
+    """
+    The value of a piece of the given type on each square, indexed by square, counted positively
+    for white and negatively for black.
+    """
+    table = _PIECE_SQUARE_TABLES[piece_type]
+    # Both players always have a king, so its value is left out rather than cancelling out
+    value = 0 if piece_type is King else PIECE_VALUES[piece_type]
+    scores = []
+    for index in range(BOARD_SIZE * BOARD_SIZE):
+        row, col = divmod(index, BOARD_SIZE)
+        if player == Player.WHITE:
+            scores.append(value + table[(BOARD_SIZE - 1 - row) * BOARD_SIZE + col])
+        else:
+            scores.append(-(value + table[row * BOARD_SIZE + col]))
+    return tuple(scores)
+
+
+SQUARE_SCORES = {
+    (player, piece_type): _square_scores(piece_type, player)
+    for player in Player
+    for piece_type in _PIECE_SQUARE_TABLES
+}
+
+DOUBLED_PAWN_PENALTY = 15
+ISOLATED_PAWN_PENALTY = 12
+PASSED_PAWN_BONUS = (0, 5, 10, 20, 35, 60, 100, 0)  # by number of rows advanced
+
+_FILES = tuple(0x0101010101010101 << col for col in range(BOARD_SIZE))
+_ADJACENT_FILES = tuple(
+    (_FILES[col - 1] if col > 0 else 0) | (_FILES[col + 1] if col < BOARD_SIZE - 1 else 0)
+    for col in range(BOARD_SIZE)
+)
+
+
+def _rows_beyond(row, player):
+    """
+    A bitboard of the rows in front of the given row, from the given player's point of view.
+    """
+    if player == Player.WHITE:
+        return ~((1 << ((row + 1) * BOARD_SIZE)) - 1) & ((1 << 64) - 1)
+    return (1 << (row * BOARD_SIZE)) - 1
+
+
+def _pawn_score(pawns, enemy_pawns, player):
+    score = 0
+    for col in range(BOARD_SIZE):
+        on_file = popcount(pawns & _FILES[col])
+        if on_file > 1:
+            score -= DOUBLED_PAWN_PENALTY * (on_file - 1)
+        if on_file and not pawns & _ADJACENT_FILES[col]:
+            score -= ISOLATED_PAWN_PENALTY * on_file
+
+    remaining = pawns
+    while remaining:
+        lowest = remaining & -remaining
+        index = lowest.bit_length() - 1
+        remaining ^= lowest
+        row, col = divmod(index, BOARD_SIZE)
+        if not enemy_pawns & (_FILES[col] | _ADJACENT_FILES[col]) & _rows_beyond(row, player):
+            score += PASSED_PAWN_BONUS[row if player == Player.WHITE else BOARD_SIZE - 1 - row]
+    return score
+
+
+def pawn_structure(white_pawns, black_pawns):
+    """
+    Scores doubled, isolated and passed pawns, positive for white and negative for black.
+    """
+    return (_pawn_score(white_pawns, black_pawns, Player.WHITE)
+            - _pawn_score(black_pawns, white_pawns, Player.BLACK))
+
+
+class PawnCache:
+    """
+    A small fixed-size cache of pawn structure scores, keyed on the pawn bitboards of both players.
+    Each pawn placement has one slot, which the newest placement to hash there overwrites.
+    """
+
+    def __init__(self, size=4096):
+        self._mask = size - 1
+        self._entries = [None] * size
+
+    def score(self, white_pawns, black_pawns):
+        slot = hash((white_pawns, black_pawns)) & self._mask
+        entry = self._entries[slot]
+        if entry is not None and entry[0] == white_pawns and entry[1] == black_pawns:
+            return entry[2]
+        score = pawn_structure(white_pawns, black_pawns)
+        self._entries[slot] = (white_pawns, black_pawns, score)
+        return score
+
+
+_pawn_cache = PawnCache()
+
+
+def evaluate(board, pawn_cache=_pawn_cache):
+    """
+    Scores the position from the point of view of the player to move.
+    """
+    score = board.piece_square_score + pawn_cache.score(
+        board.get_bitboard(Pawn, Player.WHITE), board.get_bitboard(Pawn, Player.BLACK))
+    return score if board.current_player == Player.WHITE else -score
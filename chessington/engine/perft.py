@@ -0,0 +1,179 @@
+"""
+Perft ("performance test") counts the positions reachable from a position in a given number of
+moves. The counts are a check that move generation is correct, and the time taken to find them is
+a benchmark of how fast it is.
+
+Run it with ``poetry run perft``; see ``poetry run perft --help`` for the options.
+"""
+import argparse
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine.board import Board
+
+STARTING_POSITION = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1'
+
+ReferencePosition = namedtuple('ReferencePosition', ['name', 'fen', 'counts'])
+ParallelResult = namedtuple('ParallelResult', ['nodes', 'divide', 'workers'])
+WorkerStats = namedtuple('WorkerStats', ['tasks', 'nodes', 'seconds'])
+
+# Expected counts for depths 1, 2, 3, ... of legal moves. The board has no castling, en passant or
+# promotion, so these are the published counts for positions and depths where those rules can't
+# come into play, except where noted.
+REFERENCE_POSITIONS = [
+    ReferencePosition('starting position', STARTING_POSITION, [20, 400, 8902, 197281]),
+    # Published as 2812 at depth 3, of which two are en passant captures
+    ReferencePosition('rook and pawn endgame', '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1', [14, 191, 2810]),
+    ReferencePosition(
+        'middlegame', 'r4rk1/1pp1qppp/p1np1n2/2b1p1B1/2B1P1b1/P1NP1N2/1PP1QPPP/R4RK1 w - - 0 10',
+        [46, 2079, 89890],
+    ),
+]
+
+
+def perft(board, depth):
+    """
+    Counts the positions reachable from the board's position in exactly the given number of moves.
+    """
+    if depth == 0:
+        return 1
+
+    moves = board.get_legal_moves()
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for from_square, to_square in moves:
+        board.make_move(from_square, to_square)
+        nodes += perft(board, depth - 1)
+        board.unmake_move()
+    return nodes
+
+
+def divide(board, depth):
+    """
+    Splits the perft count by the first move, as a dictionary from move to count.
+    """
+    counts = {}
+    for from_square, to_square in board.get_legal_moves():
+        board.make_move(from_square, to_square)
+        counts[from_square, to_square] = perft(board, depth - 1)
+        board.unmake_move()
+    return counts
+
+
+def _split(board, depth, root_move, tasks):
+    """
+    Collects a packed position for every move path of the given depth, tagged with its first move.
+    """
+    if depth == 0:
+        tasks.append((root_move, board.pack()))
+        return
+    for move in board.get_legal_moves():
+        board.make_move(*move)
+        _split(board, depth - 1, root_move or move, tasks)
+        board.unmake_move()
+
+
+def _perft_task(task):
+    """
+    Runs perft on a packed position in a worker process.
+    """
+    root_move, packed, depth = task
+    start = time.perf_counter()
+    nodes = perft(Board.unpack(packed), depth)
+    return root_move, nodes, os.getpid(), time.perf_counter() - start
+
+
+def parallel_perft(board, depth, workers=None, split_depth=1):
+    """
+    Runs perft across a pool of processes.
+
+    The positions split_depth moves from the root are shared out among the workers as packed
+    positions, and the results merged into the total count, the count for each root move, and
+    the tasks, nodes and time spent by each worker process.
+    """
+    split_depth = max(1, min(split_depth, depth))
+    tasks = []
+    _split(board, split_depth, None, tasks)
+
+    # Root moves whose lines end in mate or stalemate before split_depth have no tasks, but still count
+    counts = {move: 0 for move in board.get_legal_moves()}
+    worker_stats = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = [(root_move, packed, depth - split_depth) for root_move, packed in tasks]
+        chunk_size = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+        for root_move, nodes, pid, seconds in executor.map(_perft_task, jobs, chunksize=chunk_size):
+            counts[root_move] = counts.get(root_move, 0) + nodes
+            stats = worker_stats.get(pid, WorkerStats(0, 0, 0.0))
+            worker_stats[pid] = WorkerStats(stats.tasks + 1, stats.nodes + nodes, stats.seconds + seconds)
+
+    return ParallelResult(sum(counts.values()), counts, worker_stats)
+
+
+def run_suite(max_depth=None):
+    """
+    Runs perft over the reference positions, returning (position, depth, expected, actual, seconds)
+    for each count checked.
+    """
+    results = []
+    for position in REFERENCE_POSITIONS:
+        for depth, expected in enumerate(position.counts, start=1):
+            if max_depth is not None and depth > max_depth:
+                break
+            board = Board.from_fen(position.fen)
+            start = time.perf_counter()
+            actual = perft(board, depth)
+            results.append((position, depth, expected, actual, time.perf_counter() - start))
+    return results
+
+
+def _nodes_per_second(nodes, seconds):
+    return int(nodes / seconds) if seconds > 0 else 0
+
+
+def main(argv=None):
+    """Command line entry point for perft"""
+    parser = argparse.ArgumentParser(description='Count move paths to measure move generation.')
+    parser.add_argument('depth', type=int, nargs='?', default=3, help='number of moves to look ahead')
+    parser.add_argument('--fen', default=STARTING_POSITION, help='position to start from')
+    parser.add_argument('--divide', action='store_true', help='break the count down by first move')
+    parser.add_argument('--suite', action='store_true', help='check the reference positions')
+    parser.add_argument('--workers', type=int, default=0, help='number of processes to share the work between')
+    parser.add_argument('--split-depth', type=int, default=1, help='depth at which to share out work')
+    args = parser.parse_args(argv)
+
+    if args.suite:
+        failures = 0
+        total_nodes, total_seconds = 0, 0.0
+        for position, depth, expected, actual, seconds in run_suite(args.depth):
+            status = 'ok' if actual == expected else 'FAILED'
+            failures += actual != expected
+            total_nodes += actual
+            total_seconds += seconds
+            print(f'{position.name:<25} depth {depth}  {actual:>10}  expected {expected:>10}  {status}')
+        print(f'{total_nodes} nodes in {total_seconds:.3f}s ({_nodes_per_second(total_nodes, total_seconds)} nodes/s)')
+        return 1 if failures else 0
+
+    board = Board.from_fen(args.fen)
+    start = time.perf_counter()
+    worker_stats = {}
+    if args.workers and args.depth > 0:
+        result = parallel_perft(board, args.depth, args.workers, args.split_depth)
+        nodes, counts, worker_stats = result
+    elif args.divide:
+        counts = divide(board, args.depth)
+        nodes = sum(counts.values())
+    else:
+        nodes = perft(board, args.depth)
+    seconds = time.perf_counter() - start
+
+    if args.divide:
+        for (from_square, to_square), count in counts.items():
+            print(f'{from_square.name}{to_square.name}: {count}')
+    for pid, stats in sorted(worker_stats.items()):
+        print(f'worker {pid}: {stats.tasks} tasks, {stats.nodes} nodes in {stats.seconds:.3f}s')
+    print(f'{nodes} nodes in {seconds:.3f}s ({_nodes_per_second(nodes, seconds)} nodes/s)')
+    return 0
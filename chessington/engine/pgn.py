@@ -0,0 +1,210 @@
+"""
+Reading games in Portable Game Notation, and replaying them on a board.
+
+Games are read one at a time from any iterable of lines, so archives of any size can be processed
+without loading them into memory. Large files can also be split into chunks and replayed across a
+pool of processes.
+
+Castling, promotion and en passant are not supported by the board, so games that use them cannot
+be replayed and are skipped along with any other malformed games.
+"""
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen, King
+
+Game = namedtuple('Game', ['tags', 'moves', 'result'])
+
+
+class ReplayStats(namedtuple('ReplayStats', ['games', 'skipped', 'plies', 'seconds'])):
+    """
+    How many games were replayed and skipped, how many moves were made and how long it took.
+    """
+
+    @property
+    def games_per_second(self):
+        return self.games / self.seconds if self.seconds > 0 else 0.0
+
+    def __add__(self, other):
+        return ReplayStats(*(mine + theirs for mine, theirs in zip(self, other)))
+
+
+class PgnError(Exception):
+    """
+    A game could not be read or replayed.
+    """
+
+
+_TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+_COMMENT = re.compile(r'\{[^}]*\}')
+_VARIATION = re.compile(r'\([^()]*\)')
+_MOVE_NUMBER = re.compile(r'^\d+\.+')
+_SAN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(=[NBRQ])?[+#]?[!?]*$')
+
+RESULTS = ('1-0', '0-1', '1/2-1/2', '*')
+
+_PIECES_BY_LETTER = {'N': Knight, 'B': Bishop, 'R': Rook, 'Q': Queen, 'K': King}
+
+_GAME_START = b'[Event '
+
+
+def read_games(lines):
+    """
+    Yields each game found in the given lines of PGN text, as it is read.
+    """
+    tags, movetext = {}, []
+    for line in lines:
+        line = line.strip()
+        if line.startswith('%'):
+            continue
+        if line.startswith('['):
+            if movetext:
+                yield _make_game(tags, movetext)
+                tags, movetext = {}, []
+            match = _TAG.match(line)
+            if match:
+                tags[match.group(1)] = match.group(2).replace('\\"', '"')
+        elif line:
+            movetext.append(line.split(';', 1)[0])
+    if tags or movetext:
+        yield _make_game(tags, movetext)
+
+
+def _make_game(tags, movetext):
+    text = _COMMENT.sub(' ', ' '.join(movetext))
+    previous = None
+    while previous != text:
+        previous, text = text, _VARIATION.sub(' ', text)
+
+    moves, result = [], tags.get('Result', '*')
+    for token in text.split():
+        token = _MOVE_NUMBER.sub('', token)
+        if not token or token.startswith('$'):
+            continue
+        if token in RESULTS:
+            result = token
+        else:
+            moves.append(token)
+    return Game(tags, moves, result)
+
+
+def resolve_san(board, san):
+    """
+    Finds the (from_square, to_square) move for the current player described by a move in
+    Standard Algebraic Notation.
+    """
+    if san.startswith('O-O') or san.startswith('0-0'):
+        raise PgnError(f'Castling is not supported: {san}')
+    match = _SAN.match(san)
+    if match is None:
+        raise PgnError(f'Not a move: {san}')
+    piece_letter, from_file, from_rank, _, destination, promotion = match.groups()
+    if promotion:
+        raise PgnError(f'Promotion is not supported: {san}')
+
+    piece_type = _PIECES_BY_LETTER[piece_letter] if piece_letter else Pawn
+    to_square = Square.from_name(destination)
+    pieces = board.get_bitboard(piece_type, board.current_player)
+    candidates = [
+        (from_square, move_to)
+        for from_square, move_to in board.get_legal_moves()
+        if move_to == to_square
+        and pieces & (1 << from_square.index)
+        and (from_file is None or from_square.name[0] == from_file)
+        and (from_rank is None or from_square.name[1] == from_rank)
+    ]
+    if len(candidates) != 1:
+        problem = 'Illegal' if not candidates else 'Ambiguous'
+        raise PgnError(f'{problem} move: {san}')
+    return candidates[0]
+
+
+def replay(game, board=None):
+    """
+    Plays the moves of a game on a board, by default from the starting position, returning the
+    board in its final position.
+    """
+    board = board if board is not None else _starting_board(game)
+    for san in game.moves:
+        from_square, to_square = resolve_san(board, san)
+        board.move_piece(from_square, to_square)
+    return board
+
+
+def _starting_board(game):
+    if 'FEN' in game.tags:
+        try:
+            return Board.from_fen(game.tags['FEN'])
+        except ValueError as error:
+            raise PgnError(str(error)) from error
+    return Board.at_starting_position()
+
+
+def replay_games(lines, on_game=None):
+    """
+    Replays every game in the given lines of PGN text, skipping those that can't be replayed.
+
+    on_game, if given, is called with each game and its final board.
+    """
+    start = time.perf_counter()
+    games = skipped = plies = 0
+    for game in read_games(lines):
+        try:
+            board = replay(game)
+        except PgnError:
+            skipped += 1
+            continue
+        games += 1
+        plies += len(game.moves)
+        if on_game is not None:
+            on_game(game, board)
+    return ReplayStats(games, skipped, plies, time.perf_counter() - start)
+
+
+def _chunk_lines(path, start, end):
+    """
+    Yields the lines of the games that begin between the given byte offsets of a file.
+    """
+    with open(path, 'rb') as file:
+        if start > 0:
+            # Skip to the start of the first whole line in the chunk
+            file.seek(start - 1)
+            file.readline()
+        position = file.tell()
+        # Lines before the first game to start in the chunk belong to the previous chunk
+        started = start == 0
+        for line in iter(file.readline, b''):
+            if line.startswith(_GAME_START):
+                if position >= end:
+                    return
+                started = True
+            if started:
+                yield line.decode('utf-8', errors='replace')
+            position += len(line)
+
+
+def _replay_chunk(task):
+    path, start, end = task
+    return replay_games(_chunk_lines(path, start, end))
+
+
+def replay_file(path, workers=None, chunk_size=16 * 1024 * 1024):
+    """
+    Replays every game in a PGN file, sharing chunks of the file out among a pool of processes.
+
+    Each chunk is replayed from the first game to start inside it, so games must begin with an
+    Event tag, as exported games do.
+    """
+    size = os.path.getsize(path)
+    tasks = [(path, start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    total = ReplayStats(0, 0, 0, 0.0)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for stats in executor.map(_replay_chunk, tasks):
+            total += stats
+    return total._replace(seconds=time.perf_counter() - start)
@@ -4,22 +4,45 @@ Definitions of each of the different chess pieces.
 
 from abc import ABC, abstractmethod
 
-from chessington.engine.data import Player, Square
+from chessington.engine.bitboards import (
+    BOARD_SIZE, KING_MOVES, KNIGHT_MOVES, PAWN_ATTACKS, bishop_moves, queen_moves, rook_moves,
+)
+from chessington.engine.data import Player, squares_in
 
 class Piece(ABC):
     """
     An abstract base class from which all pieces inherit.
+
+    Pieces and their subclasses declare __slots__, so a piece holds only its player and no
+    instance dictionary. Boards may hold many thousands of pieces between them.
     """
 
+    __slots__ = ('player',)
+
     def __init__(self, player):
         self.player = player
 
     @abstractmethod
+    def get_move_mask(self, board, square):
+        """
+        Get a bitboard of the squares that the piece, standing on the given square, can move to.
+
+        Moves are not checked for leaving the player's own king in check.
+        """
+        pass
+
     def get_available_moves(self, board):
         """
         Get all squares that the piece is allowed to move to.
         """
-        pass
+        return squares_in(self.get_move_mask(board, board.find_piece(self)))
+
+    def get_legal_moves(self, board):
+        """
+        Get all squares that the piece can move to without leaving its king in check.
+        """
+        square = board.find_piece(self)
+        return [to_square for from_square, to_square in board.get_legal_moves() if from_square == square]
 
     def move_to(self, board, new_square):
         """
@@ -34,47 +57,40 @@ class Pawn(Piece):
     A class representing a chess pawn.
     """
 
-    def get_available_moves(self, board):
+    __slots__ = ()
+
+    def get_move_mask(self, board, square):
         if (self.player == Player.WHITE):
-            return self.move_by_side(board, 1, 1)
+            return self.move_by_side(board, square, 1, 1)
         else:
-            return self.move_by_side(board, -1, 6)
-
-    def move_by_side(self, board, move, startRow):
-            available_moves = []
-            square = board.find_piece(self)
-            if (square.row != 0 and square.row != 7):
-                forward = Square.at(square.row + move, square.col)
-                if (board.get_piece(forward) == None):
-                    available_moves.append(forward)
-
-                    twoForward = Square.at(square.row + (move * 2), square.col)
-                    if(square.row == startRow and board.get_piece(twoForward) == None):
-                        available_moves.append(twoForward)
-
-                if square.col >= 1 and square.col <= 7:
-                    leftAttack = Square.at(square.row + move, square.col - 1)
-                    leftTarget = board.get_piece(leftAttack)
-                    if (leftTarget != None):
-                        if (leftTarget.player != self.player):
-                            available_moves.append(leftAttack)
-
-                if square.col >= 0 and square.col <= 6:
-                    rightAttack = Square.at(square.row + move, square.col + 1)
-                    rightTarget = board.get_piece(rightAttack)
-                    if (rightTarget != None):
-                        if (rightTarget.player != self.player):
-                            available_moves.append(rightAttack)
-                    
-            return available_moves
+            return self.move_by_side(board, square, -1, 6)
+
+    def move_by_side(self, board, square, move, startRow):
+            if square.row == 0 or square.row == 7:
+                return 0
+
+            occupied = board.get_occupancy()
+            targets = PAWN_ATTACKS[move][square.index] & board.get_occupancy(self.player.opponent())
+
+            forward = square.index + move * BOARD_SIZE
+            if not occupied >> forward & 1:
+                targets |= 1 << forward
+
+                twoForward = forward + move * BOARD_SIZE
+                if square.row == startRow and not occupied >> twoForward & 1:
+                    targets |= 1 << twoForward
+
+            return targets
 
 class Knight(Piece):
     """
     A class representing a chess knight.
     """
 
-    def get_available_moves(self, board):
-        return []
+    __slots__ = ()
+
+    def get_move_mask(self, board, square):
+        return KNIGHT_MOVES[square.index] & ~board.get_occupancy(self.player)
 
 
 class Bishop(Piece):
@@ -82,8 +98,11 @@ class Bishop(Piece):
     A class representing a chess bishop.
     """
 
-    def get_available_moves(self, board):
-        return []
+    __slots__ = ()
+
+    def get_move_mask(self, board, square):
+        moves = bishop_moves(square.index, board.get_occupancy())
+        return moves & ~board.get_occupancy(self.player)
 
 
 class Rook(Piece):
@@ -91,8 +110,11 @@ class Rook(Piece):
     A class representing a chess rook.
     """
 
-    def get_available_moves(self, board):
-        return []
+    __slots__ = ()
+
+    def get_move_mask(self, board, square):
+        moves = rook_moves(square.index, board.get_occupancy())
+        return moves & ~board.get_occupancy(self.player)
 
 
 class Queen(Piece):
@@ -100,8 +122,11 @@ class Queen(Piece):
     A class representing a chess queen.
     """
 
-    def get_available_moves(self, board):
-        return []
+    __slots__ = ()
+
+    def get_move_mask(self, board, square):
+        moves = queen_moves(square.index, board.get_occupancy())
+        return moves & ~board.get_occupancy(self.player)
 
 
 class King(Piece):
@@ -109,29 +134,10 @@ class King(Piece):
     A class representing a chess king.
     """
 
-    def get_available_moves(self, board):
-        base_moves = self.get_base_moves(board)
-        available_moves = []        
-        for square in base_moves:
-            if square.row <= -1 or square.row >= 8 or square.col <= -1 or square.col >= 8:
-                continue
-            potentialTarget = board.get_piece(square)
-            if (potentialTarget == None or (potentialTarget.player != self.player)):
-                available_moves.append(square)
-        
-        return available_moves
-
-       
-    def get_base_moves(self, board):
-        base_moves = []
-        square = board.find_piece(self)
-        base_moves.append(Square.at(square.row - 1, square.col - 1))
-        base_moves.append(Square.at(square.row - 1, square.col - 0))
-        base_moves.append(Square.at(square.row - 1, square.col + 1))
-        base_moves.append(Square.at(square.row - 0, square.col - 1))
-        base_moves.append(Square.at(square.row - 0, square.col + 1))
-        base_moves.append(Square.at(square.row + 1, square.col - 1))
-        base_moves.append(Square.at(square.row + 1, square.col - 0))
-        base_moves.append(Square.at(square.row + 1, square.col + 1))
-
-        return base_moves
\ No newline at end of file
+    __slots__ = ()
+
+    def get_move_mask(self, board, square):
+        return KING_MOVES[square.index] & ~board.get_occupancy(self.player)
+
+
+PIECE_TYPES = (Pawn, Knight, Bishop, Rook, Queen, King)
@@ -0,0 +1,311 @@
+"""
+A computer player: a negamax alpha-beta search that picks a move for the player whose turn it is.
+
+The search deepens one move at a time until it runs out of depth, time or nodes, so it always has
+a move from the last completed depth to fall back on. Each iteration searches a narrow window
+around the previous score first, only widening it if the score falls outside. Moves are tried in
+the order most likely to cut the search short: the best move from the transposition table, then
+captures (most valuable victim first), then quiet moves that caused cut-offs at the same depth
+elsewhere (killers), then quiet moves by how often they have caused cut-offs (history).
+"""
+import time
+from collections import namedtuple
+
+from chessington.engine.evaluation import PIECE_VALUES, evaluate
+from chessington.engine.transposition import Bound, TranspositionTable
+
+INFINITY = 1000000
+MATE_SCORE = 100000
+MATE_BOUND = MATE_SCORE - 1000
+ASPIRATION_WINDOW = 50
+MAX_PLY = 128
+
+# How many nodes to search between checks of the time budget and for a stop: at a few thousand
+# nodes a second this is a handful of milliseconds
+_BUDGET_CHECK_INTERVAL = 64
+
+
+class SearchResult(namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes', 'seconds', 'pv'])):
+    """
+    The outcome of searching to a given depth: the best move and its score from the point of view
+    of the player to move, along with the principal variation and the work done to find them.
+    """
+
+    @property
+    def nodes_per_second(self):
+        return int(self.nodes / self.seconds) if self.seconds > 0 else 0
+
+
+class _SearchAborted(Exception):
+    """
+    Raised inside the search to unwind it once the budget is spent or it has been stopped.
+    """
+
+
+def _score_to_table(score, ply):
+    """
+    Mate scores are stored relative to the position rather than the root of the search.
+    """
+    if score > MATE_BOUND:
+        return score + ply
+    if score < -MATE_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    if score > MATE_BOUND:
+        return score - ply
+    if score < -MATE_BOUND:
+        return score + ply
+    return score
+
+
+class Search:
+    """
+    A search of the positions reachable from a board, which is explored in place and left as it
+    was found.
+
+    A search can be run several times, keeping what it learned about move ordering, and can be
+    stopped from another thread with stop().
+    """
+
+    def __init__(self, board, table=None):
+        self.board = board
+        self.table = table if table is not None else TranspositionTable()
+        self.nodes = 0
+        self._killers = [[None, None] for _ in range(MAX_PLY)]
+        self._history = [0] * (64 * 64)
+        self._stopped = False
+        self._deadline = None
+        self._node_limit = None
+        self._next_check = _BUDGET_CHECK_INTERVAL
+        self._root_move = None
+
+    def stop(self):
+        """
+        Asks a running search to finish as soon as possible, returning its best move so far.
+
+        If no search is running, the next run stops straight away instead, so a stop sent from
+        another thread just before the search starts is not lost.
+        """
+        self._stopped = True
+
+    def run(self, max_depth=MAX_PLY, time_limit=None, node_limit=None, on_iteration=None):
+        """
+        Searches for the best move, deepening until max_depth is reached, time_limit seconds pass
+        or node_limit nodes have been searched.
+
+        on_iteration, if given, is called with the SearchResult of each completed depth. Returns
+        the result of the deepest completed search, or None if the player has no moves.
+        """
+        start = time.perf_counter()
+        self.nodes = 0
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._node_limit = node_limit
+        self._next_check = self._budget_check_after(0)
+        self._root_move = None
+
+        result = None
+        score = 0
+        for depth in range(1, min(max_depth, MAX_PLY - 1) + 1):
+            if self._stopped:
+                break
+            try:
+                if depth >= 3:
+                    alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+                    score = self._negamax(depth, alpha, beta, 0)
+                    if score <= alpha or score >= beta:
+                        score = self._negamax(depth, -INFINITY, INFINITY, 0)
+                else:
+                    score = self._negamax(depth, -INFINITY, INFINITY, 0)
+            except _SearchAborted:
+                break
+
+            if self._root_move is None:
+                break
+            seconds = time.perf_counter() - start
+            result = SearchResult(self._root_move, score, depth, self.nodes, seconds, self._principal_variation(depth))
+            if on_iteration is not None:
+                on_iteration(result)
+            if abs(score) > MATE_BOUND:
+                break
+
+        if result is None and self._root_move is not None:
+            # Stopped part way through the first iteration: the best move found so far will do
+            result = SearchResult(self._root_move, 0, 0, self.nodes, time.perf_counter() - start, [self._root_move])
+        if result is None:
+            moves = self.board.get_legal_moves()
+            if moves:
+                result = SearchResult(moves[0], 0, 0, self.nodes, time.perf_counter() - start, [moves[0]])
+
+        # Any stop has now been acted on, so the next run starts afresh
+        self._stopped = False
+        return result
+
+    def _budget_check_after(self, nodes):
+        # The node limit is checked exactly, so it is never overshot
+        next_check = nodes + _BUDGET_CHECK_INTERVAL
+        if self._node_limit is not None:
+            next_check = min(next_check, self._node_limit)
+        return next_check
+
+    def _check_budget(self):
+        self._next_check = self._budget_check_after(self.nodes)
+        if self._stopped:
+            raise _SearchAborted()
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise _SearchAborted()
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise _SearchAborted()
+
+    def _negamax(self, depth, alpha, beta, ply):
+        if depth <= 0:
+            return self._quiesce(alpha, beta, ply)
+
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_budget()
+
+        board = self.board
+        if ply > 0 and (board.is_repetition() or board.is_fifty_move_draw()):
+            # Repeating a position once is enough: if it was worth repeating, it can be repeated again
+            return 0
+
+        key = board.zobrist_key
+        table_move = None
+        entry = self.table.probe(key)
+        if entry is not None:
+            table_depth, table_score, bound, table_move = entry
+            if ply > 0 and table_depth >= depth:
+                table_score = _score_from_table(table_score, ply)
+                if bound == Bound.EXACT:
+                    return table_score
+                if bound == Bound.LOWER and table_score >= beta:
+                    return table_score
+                if bound == Bound.UPPER and table_score <= alpha:
+                    return table_score
+
+        moves = board.get_legal_moves()
+        if not moves:
+            return -(MATE_SCORE - ply) if board.is_in_check() else 0
+
+        original_alpha = alpha
+        best_score, best_move = -INFINITY, None
+        for move in self._ordered_moves(moves, table_move, ply):
+            from_square, to_square = move
+            is_capture = board.get_piece(to_square) is not None
+
+            board.make_move(from_square, to_square)
+            try:
+                score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+
+            if score > best_score:
+                best_score, best_move = score, move
+                if ply == 0:
+                    self._root_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if not is_capture:
+                    self._record_cutoff(move, depth, ply)
+                break
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.table.store(key, depth, _score_to_table(best_score, ply), bound, best_move)
+        return best_score
+
+    def _quiesce(self, alpha, beta, ply):
+        """
+        Searches captures only, so that positions are not scored in the middle of an exchange.
+        """
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self._check_budget()
+
+        board = self.board
+        standing_score = evaluate(board)
+        if standing_score >= beta or ply >= MAX_PLY - 1:
+            return standing_score
+        if standing_score > alpha:
+            alpha = standing_score
+
+        captures = [move for move in board.get_legal_moves() if board.get_piece(move[1]) is not None]
+        captures.sort(key=self._capture_order, reverse=True)
+        for from_square, to_square in captures:
+            board.make_move(from_square, to_square)
+            try:
+                score = -self._quiesce(-beta, -alpha, ply + 1)
+            finally:
+                board.unmake_move()
+
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _capture_order(self, move):
+        """
+        Orders captures by most valuable victim, then least valuable attacker.
+        """
+        from_square, to_square = move
+        victim = self.board.get_piece(to_square)
+        attacker = self.board.get_piece(from_square)
+        return PIECE_VALUES[type(victim)] * 10 - PIECE_VALUES[type(attacker)] // 100
+
+    def _ordered_moves(self, moves, table_move, ply):
+        board = self.board
+        killers = self._killers[ply]
+        history = self._history
+
+        def order(move):
+            if move == table_move:
+                return 3 * INFINITY
+            if board.get_piece(move[1]) is not None:
+                return 2 * INFINITY + self._capture_order(move)
+            if move == killers[0] or move == killers[1]:
+                return INFINITY
+            return history[move[0].index * 64 + move[1].index]
+
+        return sorted(moves, key=order, reverse=True)
+
+    def _record_cutoff(self, move, depth, ply):
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self._history[move[0].index * 64 + move[1].index] += depth * depth
+
+    def _principal_variation(self, depth):
+        """
+        Follows the best moves stored in the transposition table from the current position.
+        """
+        board = self.board
+        pv = []
+        try:
+            while len(pv) < depth:
+                entry = self.table.probe(board.zobrist_key)
+                if entry is None or entry[3] is None or entry[3] not in board.get_legal_moves():
+                    break
+                pv.append(entry[3])
+                board.make_move(*entry[3])
+        finally:
+            for _ in pv:
+                board.unmake_move()
+        return pv
+
+
+def choose_move(board, time_limit=1.0, max_depth=MAX_PLY):
+    """
+    Picks a move for the player whose turn it is within the given number of seconds.
+    """
+    result = Search(board).run(max_depth=max_depth, time_limit=time_limit)
+    return result.move if result is not None else None
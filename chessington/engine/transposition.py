@@ -0,0 +1,127 @@
+"""
+A fixed-size transposition table, for remembering the results of searching positions that are
+reached more than once.
+"""
+from array import array
+from enum import IntEnum
+
+from chessington.engine.data import SQUARES
+
+ENTRY_SIZE = 16  # bytes: 8 for the key, 4 for the score, 2 for the move, 1 each for depth and bound
+ENTRIES_PER_BUCKET = 2
+
+NO_MOVE = 0xFFFF
+
+
+class Bound(IntEnum):
+    """
+    How a stored score relates to the true score of the position.
+    """
+    EXACT = 1
+    LOWER = 2
+    UPPER = 3
+
+
+def encode_move(move):
+    """
+    Packs a (from_square, to_square) move into 12 bits.
+    """
+    if move is None:
+        return NO_MOVE
+    from_square, to_square = move
+    return from_square.index << 6 | to_square.index
+
+
+def decode_move(code):
+    """
+    Unpacks a move packed by encode_move.
+    """
+    if code == NO_MOVE:
+        return None
+    return SQUARES[code >> 6], SQUARES[code & 0x3F]
+
+
+class TranspositionTable:
+    """
+    A table of search results keyed by Zobrist key, using a fixed amount of memory.
+
+    Entries are held in parallel arrays rather than as objects. They are grouped in buckets of
+    two: the first entry of a bucket is only replaced by a search at least as deep, while the
+    second is always replaced, so deep results survive without shallow ones being lost.
+
+    Every probe counts as either a hit or a miss; misses where the bucket held other positions are
+    also counted as collisions.
+    """
+
+    def __init__(self, size_mb=16):
+        bucket_count = 1
+        while bucket_count * 2 * ENTRIES_PER_BUCKET * ENTRY_SIZE <= size_mb * 1024 * 1024:
+            bucket_count *= 2
+        self._bucket_mask = bucket_count - 1
+
+        entry_count = bucket_count * ENTRIES_PER_BUCKET
+        self._keys = array('Q', bytes(8 * entry_count))
+        self._scores = array('i', bytes(4 * entry_count))
+        self._moves = array('H', [NO_MOVE]) * entry_count
+        self._depths = array('b', bytes(entry_count))
+        self._bounds = array('B', bytes(entry_count))
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+
+    def __len__(self):
+        """
+        The number of entries the table can hold.
+        """
+        return len(self._keys)
+
+    def clear(self):
+        """
+        Forgets every stored entry and resets the counters.
+        """
+        entry_count = len(self._keys)
+        self._keys = array('Q', bytes(8 * entry_count))
+        self._bounds = array('B', bytes(entry_count))
+        self.hits = self.misses = self.collisions = 0
+
+    def probe(self, key):
+        """
+        Looks up a position, returning its (depth, score, bound, move) or None if it isn't stored.
+        """
+        slot = (key & self._bucket_mask) * ENTRIES_PER_BUCKET
+        for entry in (slot, slot + 1):
+            if self._keys[entry] == key and self._bounds[entry]:
+                self.hits += 1
+                return (
+                    self._depths[entry],
+                    self._scores[entry],
+                    Bound(self._bounds[entry]),
+                    decode_move(self._moves[entry]),
+                )
+
+        self.misses += 1
+        if self._bounds[slot] or self._bounds[slot + 1]:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, bound, move=None):
+        """
+        Records the result of searching a position to the given depth.
+        """
+        slot = (key & self._bucket_mask) * ENTRIES_PER_BUCKET
+        if self._keys[slot] != key and self._bounds[slot] and depth < self._depths[slot]:
+            slot += 1
+
+        self._keys[slot] = key
+        self._depths[slot] = depth
+        self._scores[slot] = score
+        self._bounds[slot] = bound
+        self._moves[slot] = encode_move(move)
+
+    def hashfull(self):
+        """
+        How full the table is, in parts per thousand, estimated from its first thousand entries.
+        """
+        sample = self._bounds[:1000]
+        return sum(1 for bound in sample if bound) * 1000 // len(sample)
@@ -0,0 +1,23 @@
+"""
+Random keys for Zobrist hashing of positions.
+
+A position's key is the exclusive-or of the key for each piece on its square, together with
+BLACK_TO_MOVE when it is black's turn. Because exclusive-or is its own inverse, the key can be
+kept up to date as pieces are added and removed rather than being recomputed.
+"""
+import random
+
+from chessington.engine.bitboards import BOARD_SIZE
+from chessington.engine.data import Player
+from chessington.engine.pieces import PIECE_TYPES
+
+# A fixed seed keeps keys stable between runs, so they can be stored and compared
+_random = random.Random(0x5EED)
+
+PIECE_KEYS = {
+    (player, piece_type): tuple(_random.getrandbits(64) for _ in range(BOARD_SIZE * BOARD_SIZE))
+    for player in Player
+    for piece_type in PIECE_TYPES
+}
+
+BLACK_TO_MOVE = _random.getrandbits(64)
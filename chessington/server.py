@@ -0,0 +1,413 @@
+"""
+A headless server that hosts many games at once, for other programs to play through.
+
+Clients connect over TCP or a Unix socket and send one JSON object per line; the server replies
+with one JSON object per line. Every request may carry an "id", which is copied into its reply so
+that requests can be sent without waiting for earlier replies. Requests are:
+
+    {"op": "new", "fen": ...}                     start a game, from the starting position by default
+    {"op": "move", "session": ..., "move": "e2e4"}  make a move, if it is legal
+    {"op": "state", "session": ...}               describe the position and the legal moves
+    {"op": "engine", "session": ..., "time": 1.0, "play": false}
+                                                  ask the computer for a move, and optionally play it
+    {"op": "close", "session": ...}               end a game
+    {"op": "stats"}                               report on the server's sessions and latency
+
+Replies have "ok" set to true along with the results, or to false with an "error" message. Engine
+searches run in a pool of processes, so they never hold up other sessions. A small client for
+talking to the server is included.
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import sys
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+from types import FunctionType, ModuleType
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.search import Search
+from chessington.uci import move_to_uci
+
+DEFAULT_PORT = 7474
+DEFAULT_ENGINE_TIME = 1.0
+MAX_ENGINE_TIME = 60.0
+
+# How many recent move validations the latency figures are worked out from
+LATENCY_SAMPLES = 10000
+# How many sessions are measured to estimate the memory used by each one
+MEMORY_SAMPLES = 100
+
+
+class RequestError(Exception):
+    """
+    A request could not be carried out. The message is sent back to the client.
+    """
+
+
+def _search_in_worker(packed, halfmove_clock, history, time_limit):
+    """
+    Searches a packed position in a worker process, returning the best move as square indices.
+
+    The halfmove clock and the keys of the positions since the last pawn move or capture are sent
+    with the position, so the search can see draws by repetition and the fifty-move rule.
+    """
+    board = Board.unpack(packed, halfmove_clock, history)
+    result = Search(board).run(time_limit=time_limit)
+    if result is None:
+        return None
+    from_square, to_square = result.move
+    return from_square.index, to_square.index
+
+
+# Objects shared between all sessions, which don't count towards the memory of any one of them
+_SHARED_TYPES = (type, ModuleType, FunctionType, Enum, Square)
+
+
+def deep_size(obj):
+    """
+    Estimates the memory, in bytes, held by an object and everything it refers to.
+    """
+    seen, pending, size = set(), [obj], 0
+    while pending:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _SHARED_TYPES):
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        pending.extend(gc.get_referents(item))
+    return size
+
+
+def percentile(samples, fraction):
+    """
+    The value below which the given fraction of the samples fall, or 0 if there are none.
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class GameServer:
+    """
+    The games hosted by the server, keyed by session ID, and the work of answering requests about
+    them. Sessions outlive connections, so a client can pick up a game after reconnecting.
+    """
+
+    def __init__(self, workers=None):
+        self.sessions = {}
+        self._workers = workers
+        self._executor = None
+        self._validation_seconds = deque(maxlen=LATENCY_SAMPLES)
+        self._moves_validated = 0
+        self._requests = 0
+
+    def close(self):
+        """
+        Shuts down the engine's worker processes.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def handle_connection(self, reader, writer):
+        """
+        Answers the requests sent over one connection until the client disconnects.
+        """
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line):
+            reply = await self.handle_line(line)
+            async with write_lock:
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def handle_line(self, line):
+        """
+        Answers one line of JSON, returning the reply.
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError('Requests must be JSON objects')
+            request_id = request.get('id')
+            reply = await self.handle_request(request)
+            reply['ok'] = True
+        except json.JSONDecodeError as error:
+            reply = {'ok': False, 'error': f'Invalid JSON: {error}'}
+        except RequestError as error:
+            reply = {'ok': False, 'error': str(error)}
+        except Exception as error:
+            # Whatever went wrong, the client is still owed a reply
+            reply = {'ok': False, 'error': f'Internal error: {error!r}'}
+        if request_id is not None:
+            reply['id'] = request_id
+        return reply
+
+    async def handle_request(self, request):
+        """
+        Carries out one request, returning the results for the reply.
+        """
+        self._requests += 1
+        op = request.get('op')
+        if op == 'new':
+            return self._new_game(request.get('fen'))
+        if op == 'move':
+            return self._move(self._session(request), request.get('move'))
+        if op == 'state':
+            return self._state(self._session(request))
+        if op == 'engine':
+            return await self._engine(request.get('session'), request.get('time', DEFAULT_ENGINE_TIME),
+                                      bool(request.get('play', False)))
+        if op == 'close':
+            self._session(request)
+            del self.sessions[request['session']]
+            return {}
+        if op == 'stats':
+            return self.stats()
+        raise RequestError(f'Unknown op: {op!r}')
+
+    def _session(self, request):
+        board = self.sessions.get(request.get('session'))
+        if board is None:
+            raise RequestError(f'No such session: {request.get("session")!r}')
+        return board
+
+    def _new_game(self, fen):
+        try:
+            board = Board.from_fen(fen) if fen else Board.at_starting_position()
+        except ValueError as error:
+            raise RequestError(str(error)) from error
+        session = uuid.uuid4().hex
+        self.sessions[session] = board
+        return {'session': session, 'fen': board.to_fen()}
+
+    def _move(self, board, text):
+        start = time.perf_counter()
+        try:
+            from_square, to_square = Square.from_name(text[:2]), Square.from_name(text[2:])
+        except (TypeError, ValueError):
+            raise RequestError(f'Not a move: {text!r}') from None
+        piece = board.get_piece(from_square)
+        legal = (piece is not None and piece.player == board.current_player
+                 and to_square in piece.get_legal_moves(board))
+        self._validation_seconds.append(time.perf_counter() - start)
+        self._moves_validated += 1
+        if not legal:
+            raise RequestError(f'Illegal move: {text}')
+
+        board.move_piece(from_square, to_square)
+        return {'fen': board.to_fen(), 'status': _status(board)}
+
+    def _state(self, board):
+        return {
+            'fen': board.to_fen(),
+            'player': board.current_player.name.lower(),
+            'moves': [move_to_uci(move) for move in board.get_legal_moves()],
+            'status': _status(board),
+        }
+
+    async def _engine(self, session, time_limit, play):
+        board = self._session({'session': session})
+        if not isinstance(time_limit, (int, float)) or not 0 < time_limit <= MAX_ENGINE_TIME:
+            raise RequestError(f'Engine time must be between 0 and {MAX_ENGINE_TIME} seconds')
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+        key = board.zobrist_key
+        loop = asyncio.get_event_loop()
+        indices = await loop.run_in_executor(self._executor, _search_in_worker, board.pack(),
+                                             board.halfmove_clock, board.repetition_history(), time_limit)
+        if indices is None:
+            return {'move': None}
+
+        move = (Square.from_index(indices[0]), Square.from_index(indices[1]))
+        reply = {'move': move_to_uci(move)}
+        if play:
+            if self.sessions.get(session) is not board or board.zobrist_key != key:
+                raise RequestError('The position changed while the engine was thinking')
+            board.move_piece(*move)
+            reply.update(fen=board.to_fen(), status=_status(board))
+        return reply
+
+    def stats(self):
+        """
+        Reports the number of sessions, the estimated memory used by each and how long moves take
+        to validate.
+        """
+        sample = list(itertools.islice(self.sessions.values(), MEMORY_SAMPLES))
+        memory = sum(deep_size(board) for board in sample) // len(sample) if sample else 0
+        return {
+            'sessions': len(self.sessions),
+            'session_memory_bytes': memory,
+            'requests': self._requests,
+            'moves_validated': self._moves_validated,
+            'move_validation_p50_ms': percentile(self._validation_seconds, 0.5) * 1000,
+            'move_validation_p99_ms': percentile(self._validation_seconds, 0.99) * 1000,
+        }
+
+
+def _status(board):
+    if board.is_checkmate():
+        return 'checkmate'
+    if board.is_stalemate():
+        return 'stalemate'
+    if board.is_threefold_repetition() or board.is_fifty_move_draw():
+        return 'draw'
+    return 'playing'
+
+
+async def start_server(game_server, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+    """
+    Starts accepting connections for the game server, on a Unix socket if a path is given and on
+    TCP otherwise. Returns the asyncio server.
+    """
+    if path is not None:
+        return await asyncio.start_unix_server(game_server.handle_connection, path=path)
+    return await asyncio.start_server(game_server.handle_connection, host, port)
+
+
+class GameClient:
+    """
+    A client for the game server. Requests may be sent concurrently: replies are matched up with
+    their requests by ID.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._listener = asyncio.ensure_future(self._listen())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+        """
+        Connects to a server, over a Unix socket if a path is given and over TCP otherwise.
+        """
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._pending.pop(reply.get('id'), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection to the server was lost'))
+            self._pending.clear()
+
+    async def request(self, op, **fields):
+        """
+        Sends a request and waits for its reply, raising RequestError if it failed.
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_event_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(json.dumps(dict(fields, op=op, id=request_id)).encode() + b'\n')
+        await self._writer.drain()
+        reply = await future
+        if not reply['ok']:
+            raise RequestError(reply['error'])
+        return reply
+
+    async def new_game(self, fen=None):
+        """Starts a game, returning its session ID"""
+        reply = await self.request('new', **({'fen': fen} if fen else {}))
+        return reply['session']
+
+    async def move(self, session, move):
+        """Makes a move, in long algebraic notation, in a game"""
+        return await self.request('move', session=session, move=move)
+
+    async def state(self, session):
+        """Describes the position of a game and its legal moves"""
+        return await self.request('state', session=session)
+
+    async def engine_move(self, session, time=DEFAULT_ENGINE_TIME, play=False):
+        """Asks the computer for a move in a game, and plays it if play is set"""
+        return await self.request('engine', session=session, time=time, play=play)
+
+    async def close_game(self, session):
+        """Ends a game"""
+        return await self.request('close', session=session)
+
+    async def stats(self):
+        """Reports on the server's sessions and how quickly it validates moves"""
+        return await self.request('stats')
+
+    async def close(self):
+        """
+        Disconnects from the server.
+        """
+        self._writer.close()
+        try:
+            await self._listener
+        except ConnectionError:
+            pass
+
+
+def main(argv=None):
+    """Command line entry point for the game server"""
+    parser = argparse.ArgumentParser(description='Host many games at once over a JSON-lines protocol.')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='TCP port to listen on')
+    parser.add_argument('--unix', metavar='PATH', help='listen on a Unix socket instead of TCP')
+    parser.add_argument('--workers', type=int, default=None, help='number of engine processes')
+    args = parser.parse_args(argv)
+
+    async def serve():
+        game_server = GameServer(args.workers)
+        server = await start_server(game_server, args.host, args.port, args.unix)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            game_server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+A headless entry point that drives the engine over the Universal Chess Interface (UCI) protocol,
+reading commands from standard input and writing replies to standard output.
+
+Searches run on a background thread, so commands such as stop and isready are answered while the
+engine is thinking. Only the engine is imported: the GUI and its image libraries are not needed.
+
+Castling, en passant and promotion are not supported by the board, so positions reached by such
+moves cannot be set up.
+"""
+import sys
+import threading
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.perft import STARTING_POSITION
+from chessington.engine.search import MATE_BOUND, MATE_SCORE, Search
+from chessington.engine.transposition import TranspositionTable
+
+ENGINE_NAME = 'Chessington'
+ENGINE_AUTHOR = 'Chessington contributors'
+
+DEFAULT_HASH_MB = 16
+MAX_HASH_MB = 1024
+
+# Without a fixed limit, a search is given this fraction of the remaining clock (plus increment)
+_DEFAULT_MOVES_TO_GO = 30
+
+
+def move_to_uci(move):
+    """
+    Writes a (from_square, to_square) move in UCI's long algebraic notation, e.g. 'e2e4'.
+    """
+    from_square, to_square = move
+    return from_square.name + to_square.name
+
+
+def move_from_uci(board, text):
+    """
+    Finds the legal move for the current player described by a move in long algebraic notation.
+    """
+    if len(text) != 4:
+        raise ValueError(f'Unsupported move: {text}')
+    move = (Square.from_name(text[:2]), Square.from_name(text[2:]))
+    if move not in board.get_legal_moves():
+        raise ValueError(f'Illegal move: {text}')
+    return move
+
+
+def _score_to_uci(score):
+    if score > MATE_BOUND:
+        return f'mate {(MATE_SCORE - score + 1) // 2}'
+    if score < -MATE_BOUND:
+        return f'mate -{(MATE_SCORE + score) // 2}'
+    return f'cp {score}'
+
+
+class UciEngine:
+    """
+    The state of a UCI session: the current position, the transposition table and any search in
+    progress. Each line of input is passed to handle, and replies are written to the output stream.
+    """
+
+    def __init__(self, output=None):
+        self.output = output if output is not None else sys.stdout
+        self.board = Board.from_fen(STARTING_POSITION)
+        self.table = TranspositionTable(DEFAULT_HASH_MB)
+        self._output_lock = threading.Lock()
+        self._search = None
+        self._thread = None
+        self._infinite = False
+        self._stopped = threading.Event()
+
+    def send(self, line):
+        with self._output_lock:
+            self.output.write(line + '\n')
+            self.output.flush()
+
+    def handle(self, line):
+        """
+        Carries out one command, returning False once the session should end.
+        """
+        words = line.split()
+        if not words:
+            return True
+        command, arguments = words[0], words[1:]
+
+        if command == 'uci':
+            self.send(f'id name {ENGINE_NAME}')
+            self.send(f'id author {ENGINE_AUTHOR}')
+            self.send(f'option name Hash type spin default {DEFAULT_HASH_MB} min 1 max {MAX_HASH_MB}')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'setoption':
+            self._set_option(arguments)
+        elif command == 'ucinewgame':
+            self.stop()
+            self.table.clear()
+            self.board = Board.from_fen(STARTING_POSITION)
+        elif command == 'position':
+            self.stop()
+            self._set_position(arguments)
+        elif command == 'go':
+            self._go(arguments)
+        elif command == 'stop':
+            self.stop()
+        elif command == 'quit':
+            self.stop()
+            return False
+        return True
+
+    def _set_option(self, arguments):
+        if 'name' not in arguments or 'value' not in arguments:
+            return
+        name = ' '.join(arguments[arguments.index('name') + 1:arguments.index('value')])
+        value = ' '.join(arguments[arguments.index('value') + 1:])
+        if name.lower() == 'hash' and value.isdigit():
+            self.stop()
+            self.table = TranspositionTable(min(max(int(value), 1), MAX_HASH_MB))
+
+    def _set_position(self, arguments):
+        moves_at = arguments.index('moves') if 'moves' in arguments else len(arguments)
+        try:
+            if arguments[:1] == ['startpos']:
+                board = Board.from_fen(STARTING_POSITION)
+            elif arguments[:1] == ['fen']:
+                board = Board.from_fen(' '.join(arguments[1:moves_at]))
+            else:
+                return
+            for text in arguments[moves_at + 1:]:
+                board.make_move(*move_from_uci(board, text))
+        except ValueError as error:
+            self.send(f'info string {error}')
+            return
+        self.board = board
+
+    def _go(self, arguments):
+        self.stop()
+        limits = {}
+        for name, value in zip(arguments, arguments[1:]):
+            if value.lstrip('-').isdigit():
+                limits[name] = int(value)
+        infinite = 'infinite' in arguments
+
+        time_limit = None
+        if 'movetime' in limits:
+            time_limit = limits['movetime'] / 1000
+        elif not infinite:
+            clock, increment = ('wtime', 'winc') if self.board.current_player == Player.WHITE else ('btime', 'binc')
+            if clock in limits:
+                moves_to_go = limits.get('movestogo', _DEFAULT_MOVES_TO_GO)
+                budget = limits[clock] / max(moves_to_go, 1) + limits.get(increment, 0) / 2
+                time_limit = max(min(budget, limits[clock] * 0.8), 1) / 1000
+
+        search = Search(self.board.copy(), self.table)
+        self._search = search
+        self._infinite = infinite
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(search, limits.get('depth', 64), time_limit, limits.get('nodes'), infinite),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, search, max_depth, time_limit, node_limit, infinite):
+        result = search.run(max_depth=max_depth, time_limit=time_limit, node_limit=node_limit,
+                            on_iteration=self._report)
+        if infinite:
+            # An infinite search must not give its move until told to stop
+            self._stopped.wait()
+        self.send('bestmove ' + (move_to_uci(result.move) if result is not None else '0000'))
+
+    def _report(self, result):
+        pv = ' '.join(move_to_uci(move) for move in result.pv)
+        self.send(f'info depth {result.depth} score {_score_to_uci(result.score)} nodes {result.nodes} '
+                  f'nps {result.nodes_per_second} time {int(result.seconds * 1000)} '
+                  f'hashfull {self.table.hashfull()} pv {pv}')
+
+    def stop(self):
+        """
+        Stops any search in progress, waiting for it to report its best move.
+        """
+        if self._thread is None:
+            return
+        self._search.stop()
+        self._stopped.set()
+        self._thread.join()
+        self._search = self._thread = None
+
+    def wait(self):
+        """
+        Waits for any search in progress to finish, stopping it if it would otherwise run forever.
+        """
+        if self._infinite:
+            self.stop()
+        elif self._thread is not None:
+            self._thread.join()
+
+
+def main():
+    """Command line entry point for UCI"""
+    engine = UciEngine()
+    for line in sys.stdin:
+        try:
+            if not engine.handle(line):
+                return 0
+        except Exception as error:
+            # A bad command shouldn't end the session: report it and carry on reading
+            engine.send(f'info string Error in {line.strip()!r}: {error!r}')
+    # Input ended without a quit, so let any search finish before exiting
+    engine.wait()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,13 +2,15 @@
 A GUI chess board that can be interacted with, and pieces moved around on.
 """
 
+import argparse
 import tkinter as tk
-from typing import Iterable
+from typing import Iterable, Optional, Set
 
 from chessington.engine.board import Board, BOARD_SIZE
-from chessington.engine.data import Square
+from chessington.engine.data import Player, Square, SQUARES
 from chessington.ui.colours import Colour
 from chessington.ui.images import ImageRepository
+from chessington.ui.thinking import BackgroundSearch
 
 WINDOW_SIZE = 60
 
@@ -26,25 +28,46 @@ def update_square(window: tk.Tk, board: Board, square: Square, colour: Colour =
     colour = colour or get_square_colour(square)
     image = images.get_image(piece, colour)
 
-    frame = window.nametowidget(square_id(square))
-    btn = frame.nametowidget('button')
-    btn.configure(image=image)
-    btn.image = image
+    btn = window.square_buttons[square]
+    if getattr(btn, 'image', None) is not image:
+        btn.configure(image=image)
+        btn.image = image
 
 
 def update_pieces_and_colours(window: tk.Tk, board: Board):
     """Refresh the GUI to reflect the board state"""
-    for row in range(BOARD_SIZE):
-        for col in range(BOARD_SIZE):
-            update_square(window, board, Square(row, col))
+    for square in SQUARES:
+        update_square(window, board, square)
+
+
+def redraw_squares(window: tk.Tk, board: Board, squares: Iterable[Square],
+                   from_square: Optional[Square], to_squares: Iterable[Square]):
+    """Re-draw only the given squares, keeping any highlights on them"""
+    for square in squares:
+        if square == from_square:
+            update_square(window, board, square, Colour.FROM_SQUARE)
+        elif square in to_squares:
+            update_square(window, board, square, Colour.TO_SQUARE)
+        else:
+            update_square(window, board, square)
 
 
-def highlight_squares(window: tk.Tk, board: Board, from_square: Square, to_squares: Iterable[Square]):
-    """Set background colours on active movement squares"""
-    if from_square is not None:
-        update_square(window, board, from_square, Colour.FROM_SQUARE)
-    for square in to_squares:
-        update_square(window, board, square, Colour.TO_SQUARE)
+def changed_squares(from_square: Optional[Square], to_squares: Iterable[Square],
+                    new_from_square: Optional[Square], new_to_squares: Iterable[Square],
+                    moved_squares: Iterable[Square] = ()) -> Set[Square]:
+    """Find the squares to redraw: those highlighted before or after, and any a move changed"""
+    squares = {from_square, *to_squares, new_from_square, *new_to_squares, *moved_squares}
+    squares.discard(None)
+    return squares
+
+
+def set_highlights(window: tk.Tk, board: Board, from_square: Optional[Square], to_squares: Iterable[Square],
+                   moved_squares: Iterable[Square] = ()):
+    """Change the highlighted squares, redrawing only those that change"""
+    to_squares = list(to_squares)
+    squares = changed_squares(window.from_square, window.to_squares, from_square, to_squares, moved_squares)
+    window.from_square, window.to_squares = from_square, to_squares
+    redraw_squares(window, board, squares, from_square, to_squares)
 
 
 def square_id(square: Square):
@@ -52,44 +75,77 @@ def square_id(square: Square):
     return f'square@{square.row}{square.col}'
 
 
-def play_game():
-    """Launch Chessington!"""
+def play_game(computer_player: Optional[Player] = None, think_time: float = 1.0):
+    """Launch Chessington!
+
+    If computer_player is given, the computer plays for that side, thinking for think_time seconds
+    a move. Pressing H asks the computer for a hint. The computer thinks in the background, so the
+    window stays responsive: clicking while it is thinking makes it move straight away, or
+    dismisses a hint that hasn't arrived yet.
+    """
     window = tk.Tk()
     window.title('Chessington')
     window.resizable(False, False)
     board = Board.at_starting_position()
+    window.square_buttons = {}
+    window.from_square = None
+    window.to_squares = []
+    engine = BackgroundSearch(window, think_time)
+
+    def play_computer_move(move):
+        if move is not None:
+            board.move_piece(*move)
+            set_highlights(window, board, None, [], move)
 
-    from_square = None
-    to_squares = []
+    def start_computer_turn():
+        if board.current_player == computer_player:
+            engine.start(board, play_computer_move)
+
+    def show_hint(move):
+        if move is not None:
+            set_highlights(window, board, move[0], [move[1]])
+
+    def request_hint(event=None):
+        if board.current_player != computer_player:
+            engine.start(board, show_hint)
 
     def generate_click_handler(clicked_square: Square):
         def handle_click():
-            nonlocal window, board, from_square, to_squares
+            if engine.thinking:
+                if board.current_player == computer_player:
+                    # Don't wait any longer for the computer: it plays its best move so far
+                    engine.stop()
+                    return
+                # The player has moved on, so a hint is no longer wanted
+                engine.cancel()
+
             clicked_piece = board.get_piece(clicked_square)
 
             # If making an allowed move, then make it
-            if from_square is not None and clicked_square in to_squares:
+            from_square = window.from_square
+            if from_square is not None and clicked_square in window.to_squares:
                 board.get_piece(from_square).move_to(board, clicked_square)
-                from_square, to_squares = None, []
+                set_highlights(window, board, None, [], (from_square, clicked_square))
+                start_computer_turn()
 
             # If clicking on a piece whose turn it is, get its allowed moves
             elif clicked_piece is not None and clicked_piece.player == board.current_player:
-                from_square = clicked_square
-                to_squares = clicked_piece.get_available_moves(board)
+                set_highlights(window, board, clicked_square, clicked_piece.get_legal_moves(board))
 
             # Otherwise reset everthing to default
             else:
-                from_square, to_squares = None, []
-
-            update_pieces_and_colours(window, board)
-            highlight_squares(window, board, from_square, to_squares)
+                set_highlights(window, board, None, [])
 
         return handle_click
 
+    def close():
+        engine.close()
+        window.destroy()
+
     # Create the board
     for row in range(BOARD_SIZE):
         for col in range(BOARD_SIZE):
-            square = Square(row, col)
+            square = Square.at(row, col)
             frame = tk.Frame(window, width=WINDOW_SIZE, height=WINDOW_SIZE, name=square_id(square))
             frame.grid_propagate(False)         # disables resizing of frame
             frame.columnconfigure(0, weight=1)  # enables button to fill frame
@@ -103,7 +159,22 @@ def play_game():
 
             btn = tk.Button(frame, command=generate_click_handler(square), name='button')
             btn.grid(sticky='wens')
+            window.square_buttons[square] = btn
+
+    window.bind('<h>', request_hint)
+    window.protocol('WM_DELETE_WINDOW', close)
 
     update_pieces_and_colours(window, board)
+    start_computer_turn()
     window.mainloop()
 
+
+def main():
+    """Command line entry point for the GUI"""
+    parser = argparse.ArgumentParser(description='Play chess in a window.')
+    parser.add_argument('--computer', choices=['white', 'black'], help='let the computer play one side')
+    parser.add_argument('--think-time', type=float, default=1.0, help='seconds the computer thinks for a move')
+    args = parser.parse_args()
+    computer_player = Player[args.computer.upper()] if args.computer else None
+    play_game(computer_player, args.think_time)
+
@@ -1,13 +1,25 @@
+import hashlib
 import os
-from typing import Optional
+from typing import List, Optional
 
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, PngImagePlugin
 
 from chessington.engine.data import Player
 from chessington.engine.pieces import Pawn, Knight, Bishop, King, Queen, Rook, Piece
 from chessington.ui.colours import Colour
 
 IMAGES_BASE_DIRECTORY = 'images'
+ATLAS_FILENAME = os.path.join(IMAGES_BASE_DIRECTORY, 'atlas.png')
+
+PIECES_WITH_IMAGES = [Pawn, Knight, Bishop, King, Queen, Rook]
+
+# The atlas has a row for each background colour and a column for each sprite, starting with the
+# empty square. Sprites are identified by (piece class, player), or (None, None) when empty.
+ATLAS_SPRITES = [(None, None)] + [(piece, player) for piece in PIECES_WITH_IMAGES for player in Player]
+ATLAS_COLOURS = list(Colour)
+
+# The PNG text chunk recording which layout an atlas was built with
+ATLAS_LAYOUT_KEY = 'chessington-layout'
 
 
 class ImageRepository:
@@ -17,36 +29,96 @@ class ImageRepository:
 
     This class works around the limitation by providing pre-processed piece images
     with all possible backgrounds.
-    """
 
-    PIECES_WITH_IMAGES = [Pawn, Knight, Bishop, King, Queen, Rook]
-
-    def __init__(self):
-        self._images = {}
-        self._load_from_disk()
-
-    def _load_from_disk(self):
-        """Load all possible images into memory to optimise performance"""
-        mapping = {}
+    The images are composed once into a sprite atlas saved alongside the piece images, and
+    rebuilt only when a piece image, the background colours or the atlas layout change. Nothing
+    is loaded until the first image is asked for, and each GUI-ready PhotoImage is cut from the
+    atlas the first time it is needed, once a Tk window exists, and then reused for every later
+    redraw.
+    """
 
-        def piece_on_all_backgrounds(piece: Optional[Piece]):
-            return {colour: get_image_with_background(piece, colour) for colour in Colour}
+    PIECES_WITH_IMAGES = PIECES_WITH_IMAGES
 
-        for piece in self.PIECES_WITH_IMAGES:
-            mapping[piece] = {}
-            mapping[piece][Player.WHITE] = piece_on_all_backgrounds(piece(Player.WHITE))
-            mapping[piece][Player.BLACK] = piece_on_all_backgrounds(piece(Player.BLACK))
+    def __init__(self, atlas_filename: str = ATLAS_FILENAME):
+        self._atlas_filename = atlas_filename
+        self._atlas = None
+        self._photo_images = {}
 
-        mapping['empty'] = piece_on_all_backgrounds(None)
-        self._images = mapping
+    def _get_atlas(self) -> Image:
+        """Load the sprite atlas, building it first if it is missing or out of date"""
+        if self._atlas is None:
+            if atlas_is_current(self._atlas_filename):
+                self._atlas = Image.open(self._atlas_filename)
+                self._atlas.load()
+            else:
+                self._atlas = build_atlas(self._atlas_filename)
+        return self._atlas
 
     def get_image(self, piece: Piece, background_colour: Colour) -> ImageTk:
         """Get a GUI-ready image of a piece on the specified background colour"""
-        if piece:
-            image = self._images[piece.__class__][piece.player][background_colour]
-        else:
-            image = self._images['empty'][background_colour]
-        return ImageTk.PhotoImage(image.convert('RGB'))
+        sprite = (piece.__class__, piece.player) if piece else (None, None)
+        key = sprite + (background_colour,)
+
+        photo_image = self._photo_images.get(key)
+        if photo_image is None:
+            atlas = self._get_atlas()
+            width = atlas.width // len(ATLAS_SPRITES)
+            height = atlas.height // len(ATLAS_COLOURS)
+            left = ATLAS_SPRITES.index(sprite) * width
+            top = ATLAS_COLOURS.index(background_colour) * height
+            image = atlas.crop((left, top, left + width, top + height))
+            photo_image = self._photo_images[key] = ImageTk.PhotoImage(image)
+        return photo_image
+
+
+def _atlas_sources() -> List[str]:
+    """The piece image files that go into the atlas, in the order of its columns"""
+    return [get_filename_for_piece(piece(player) if piece else None) for piece, player in ATLAS_SPRITES]
+
+
+def atlas_layout() -> str:
+    """A fingerprint of the atlas layout: which image goes in each column and the colour of each row"""
+    layout = repr((_atlas_sources(), [colour.value for colour in ATLAS_COLOURS]))
+    return hashlib.sha1(layout.encode()).hexdigest()
+
+
+def atlas_is_current(atlas_filename: str) -> bool:
+    """Check whether the sprite atlas exists, has the current layout and is newer than the piece images"""
+    if not os.path.exists(atlas_filename):
+        return False
+    if os.path.getmtime(atlas_filename) < max(os.path.getmtime(source) for source in _atlas_sources()):
+        return False
+    try:
+        with Image.open(atlas_filename) as atlas:
+            return atlas.info.get(ATLAS_LAYOUT_KEY) == atlas_layout()
+    except OSError:
+        return False
+
+
+def build_atlas(atlas_filename: Optional[str] = ATLAS_FILENAME) -> Image:
+    """Compose every piece on every background colour into one image, saving it if possible"""
+    sprites = [
+        [get_image_with_background(piece(player) if piece else None, colour) for piece, player in ATLAS_SPRITES]
+        for colour in ATLAS_COLOURS
+    ]
+    width, height = sprites[0][0].size
+    atlas = Image.new('RGB', (width * len(ATLAS_SPRITES), height * len(ATLAS_COLOURS)))
+    for row, images in enumerate(sprites):
+        for column, image in enumerate(images):
+            atlas.paste(image.convert('RGB'), (column * width, row * height))
+
+    if atlas_filename is not None:
+        try:
+            # Write to a temporary file first, so a half-written atlas is never picked up
+            temporary_filename = atlas_filename + '.tmp'
+            metadata = PngImagePlugin.PngInfo()
+            metadata.add_text(ATLAS_LAYOUT_KEY, atlas_layout())
+            atlas.save(temporary_filename, format='PNG', pnginfo=metadata)
+            os.replace(temporary_filename, atlas_filename)
+        except OSError:
+            # The atlas still works from memory; it will be built again next time
+            pass
+    return atlas
 
 
 def get_filename_for_piece(piece: Piece) -> str:
@@ -0,0 +1,126 @@
+"""
+Runs the engine in the background while the GUI carries on, so the window never freezes.
+
+Searches run in a separate process, so they don't compete with the Tk main loop for the
+interpreter. Finished searches are picked up by polling from the main loop with window.after, and
+a search can be stopped early, either to use its best move so far or to throw its result away.
+"""
+import threading
+import tkinter as tk
+from typing import Callable, List, Optional, Tuple
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+
+# How often to check for a finished search: about once a frame at 60 frames per second
+POLL_INTERVAL_MS = 16
+
+# How often the worker checks whether its search has been stopped, in seconds
+_WATCH_INTERVAL = 0.01
+
+_stopped_generation = None
+
+
+def _initialise_worker(stopped_generation):
+    global _stopped_generation
+    _stopped_generation = stopped_generation
+
+
+def _search_in_worker(packed: bytes, halfmove_clock: int, history: List[int], time_limit: float,
+                      generation: int) -> Optional[Tuple[int, int]]:
+    """Search a packed position, returning the best move as a pair of square indices
+
+    The halfmove clock and the keys of the positions since the last pawn move or capture are sent
+    with the position, so the search can see draws by repetition and the fifty-move rule.
+    """
+    from chessington.engine.search import Search
+
+    search = Search(Board.unpack(packed, halfmove_clock, history))
+    finished = threading.Event()
+
+    def watch():
+        while not finished.wait(_WATCH_INTERVAL):
+            if _stopped_generation.value >= generation:
+                search.stop()
+                return
+
+    threading.Thread(target=watch, daemon=True).start()
+    try:
+        result = search.run(time_limit=time_limit)
+    finally:
+        finished.set()
+    if result is None:
+        return None
+    from_square, to_square = result.move
+    return from_square.index, to_square.index
+
+
+class BackgroundSearch:
+    """
+    Searches for moves in a worker process on behalf of a Tk window, one search at a time.
+
+    Results are handed to a callback on the Tk main loop. Starting a new search cancels the
+    previous one. The worker process, and the multiprocessing machinery behind it, are only set up
+    when the first search starts, so they add nothing to the GUI's start-up.
+    """
+
+    def __init__(self, window: tk.Tk, time_limit: float = 1.0):
+        self._window = window
+        self._time_limit = time_limit
+        self._stopped_generation = None
+        self._executor = None
+        self._generation = 0
+        self._future = None
+        self._on_result = None
+        self._poll_id = None
+
+    @property
+    def thinking(self) -> bool:
+        """Whether a search is under way"""
+        return self._future is not None
+
+    def start(self, board: Board, on_result: Callable[[Optional[Tuple[Square, Square]]], None]):
+        """Start searching the board's position, calling on_result with the best move found"""
+        self.cancel()
+        if self._executor is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            self._stopped_generation = multiprocessing.Value('i', 0)
+            self._executor = ProcessPoolExecutor(
+                max_workers=1, initializer=_initialise_worker, initargs=(self._stopped_generation,))
+        self._generation += 1
+        self._future = self._executor.submit(_search_in_worker, board.pack(), board.halfmove_clock,
+                                             board.repetition_history(), self._time_limit, self._generation)
+        self._on_result = on_result
+        self._poll_id = self._window.after(POLL_INTERVAL_MS, self._poll)
+
+    def stop(self):
+        """Ask the search to finish now; its best move so far is still passed to the callback"""
+        if self._future is not None:
+            self._stopped_generation.value = self._generation
+
+    def cancel(self):
+        """Stop the search and forget about it, so the callback is never called"""
+        if self._future is None:
+            return
+        self.stop()
+        self._window.after_cancel(self._poll_id)
+        self._future = self._on_result = self._poll_id = None
+
+    def close(self):
+        """Cancel any search and shut down the worker process"""
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _poll(self):
+        if not self._future.done():
+            self._poll_id = self._window.after(POLL_INTERVAL_MS, self._poll)
+            return
+
+        future, on_result = self._future, self._on_result
+        self._future = self._on_result = self._poll_id = None
+        indices = future.result()
+        on_result(None if indices is None else tuple(Square.from_index(index) for index in indices))
@@ -0,0 +1,97 @@
+"""
+Times the GUI's start-up: importing chessington.ui from scratch, then getting the piece images
+ready, comparing the old approach of compositing every piece on every background at start-up with
+loading the sprite atlas.
+
+Run from the repository root (the images are found relative to it):
+
+    poetry run python scripts/ui_startup_timing.py
+
+If a display is available, the time from creating the window to its first paint is measured too.
+"""
+import importlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Run in a fresh interpreter each time, so nothing is already imported
+_IMPORT_TIMER = (
+    'import time; start = time.perf_counter(); import chessington.ui; '
+    'print((time.perf_counter() - start) * 1000)'
+)
+
+
+def eager_compositing(images, Colour):
+    """What ImageRepository used to do on import: compose all 13 images on all 4 backgrounds"""
+    for piece, player in images.ATLAS_SPRITES:
+        for colour in Colour:
+            images.get_image_with_background(piece(player) if piece else None, colour).convert('RGB')
+
+
+def time_it(function, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def import_time(repeats=5):
+    """The best end-to-end time to import chessington.ui in a new interpreter, in milliseconds"""
+    return min(
+        float(subprocess.run([sys.executable, '-c', _IMPORT_TIMER], check=True, capture_output=True,
+                             text=True).stdout)
+        for _ in range(repeats)
+    )
+
+
+def main():
+    print(f'import chessington.ui:            {import_time():7.1f} ms')
+
+    from chessington.engine.data import SQUARES
+    from chessington.ui.colours import Colour
+    images = importlib.import_module('chessington.ui.images')
+
+    with tempfile.TemporaryDirectory() as directory:
+        atlas_filename = os.path.join(directory, 'atlas.png')
+
+        def cold_atlas():
+            if os.path.exists(atlas_filename):
+                os.remove(atlas_filename)
+            images.ImageRepository(atlas_filename)._get_atlas()
+
+        def warm_atlas():
+            images.ImageRepository(atlas_filename)._get_atlas()
+
+        print(f'eager compositing (old start-up): {time_it(lambda: eager_compositing(images, Colour)):7.1f} ms')
+        print(f'first run, building the atlas:    {time_it(cold_atlas):7.1f} ms')
+        print(f'later runs, loading the atlas:    {time_it(warm_atlas):7.1f} ms')
+
+        try:
+            import tkinter as tk
+            window = tk.Tk()
+        except Exception as error:
+            print(f'time to first paint:              skipped ({error})')
+            return 0
+
+        from chessington.engine.board import Board
+        from chessington.ui import square_id, update_pieces_and_colours
+        start = time.perf_counter()
+        window.square_buttons = {}
+        for square in SQUARES:
+            frame = tk.Frame(window, name=square_id(square))
+            frame.grid(row=7 - square.row, column=square.col)
+            window.square_buttons[square] = tk.Button(frame)
+            window.square_buttons[square].grid()
+        update_pieces_and_colours(window, Board.at_starting_position())
+        window.update()
+        print(f'time to first paint:              {(time.perf_counter() - start) * 1000:7.1f} ms')
+        window.destroy()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
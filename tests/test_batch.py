@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.perft import REFERENCE_POSITIONS
+
+batch = pytest.importorskip('chessington.engine.batch')
+
+def random_positions(count, seed=0):
+    rng = random.Random(seed)
+    boards = []
+    for position in REFERENCE_POSITIONS:
+        for _ in range(count):
+            board = Board.from_fen(position.fen)
+            for _ in range(rng.randrange(30)):
+                moves = board.get_moves()
+                if not moves:
+                    break
+                board.make_move(*rng.choice(moves))
+            boards.append(board)
+    return boards
+
+def test_starting_position_has_twenty_moves():
+
+    # Arrange
+    codes, black_to_move = batch.from_boards([Board.at_starting_position()])
+
+    # Act
+    counts = batch.count_moves(codes, black_to_move)
+
+    # Assert
+    assert list(counts) == [20]
+
+def test_move_counts_match_the_board():
+
+    # Arrange
+    boards = random_positions(20)
+    codes, black_to_move = batch.from_boards(boards)
+
+    # Act
+    counts = batch.count_moves(codes, black_to_move)
+
+    # Assert
+    assert list(counts) == [len(board.get_moves()) for board in boards]
+
+def test_move_masks_match_the_board():
+
+    # Arrange
+    boards = random_positions(20, seed=1)
+    codes, black_to_move = batch.from_boards(boards)
+
+    # Act
+    masks = batch.move_masks(codes, black_to_move)
+
+    # Assert
+    expected = [sum({1 << to_square.index for _, to_square in board.get_moves()}) for board in boards]
+    assert [int(mask) for mask in masks] == expected
@@ -1,5 +1,8 @@
+import pytest
+
 from chessington.engine.board import Board
 from chessington.engine.data import Player, Square
+from chessington.engine.pieces import King, Pawn, Rook
 
 def test_new_board_has_white_pieces_at_bottom():
 
@@ -35,4 +38,497 @@ def test_pieces_can_be_moved_on_the_board():
     board.move_piece(from_square, to_square)
 
     assert board.get_piece(from_square) is None
-    assert board.get_piece(to_square) is piece
\ No newline at end of file
+    assert board.get_piece(to_square) is piece
+
+def test_squares_off_the_board_are_rejected():
+
+    # Arrange
+    board = Board.at_starting_position()
+    key = board.zobrist_key
+
+    # Act / Assert
+    with pytest.raises(IndexError):
+        board.get_piece(Square.at(0, 8))
+    with pytest.raises(IndexError):
+        board.set_piece(Square.at(-1, 3), Pawn(Player.WHITE))
+    assert board.zobrist_key == key
+    assert board.get_piece(Square.at(0, 3)) is not None
+
+def test_new_board_has_occupancy_masks_for_both_players():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    white = board.get_occupancy(Player.WHITE)
+    black = board.get_occupancy(Player.BLACK)
+
+    # Assert
+    assert white == 0x000000000000FFFF
+    assert black == 0xFFFF000000000000
+    assert board.get_occupancy() == white | black
+
+def test_new_board_has_bitboards_for_each_piece_type():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    white_rooks = board.get_bitboard(Rook, Player.WHITE)
+    black_pawns = board.get_bitboard(Pawn, Player.BLACK)
+
+    # Assert
+    assert white_rooks == (1 << 0) | (1 << 7)
+    assert black_pawns == 0x00FF000000000000
+
+def test_moving_a_piece_updates_the_bitboards():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.move_piece(Square.at(1, 0), Square.at(3, 0))
+
+    # Assert
+    assert board.get_bitboard(Pawn, Player.WHITE) == 0x000000000100FE00
+    assert board.get_occupancy(Player.WHITE) & (1 << 8) == 0
+    assert board.get_occupancy(Player.WHITE) & (1 << 24) != 0
+
+def test_capturing_a_piece_removes_it_from_the_bitboards():
+
+    # Arrange
+    board = Board.empty()
+    board.set_piece(Square.at(3, 3), Rook(Player.WHITE))
+    board.set_piece(Square.at(5, 3), Pawn(Player.BLACK))
+
+    # Act
+    board.move_piece(Square.at(3, 3), Square.at(5, 3))
+
+    # Assert
+    assert board.get_bitboard(Pawn, Player.BLACK) == 0
+    assert board.get_occupancy(Player.BLACK) == 0
+    assert board.get_bitboard(Rook, Player.WHITE) == 1 << 43
+
+def test_pieces_can_be_found_after_moving():
+
+    # Arrange
+    board = Board.at_starting_position()
+    from_square = Square.at(1, 4)
+    piece = board.get_piece(from_square)
+
+    # Act
+    to_square = Square.at(3, 4)
+    board.move_piece(from_square, to_square)
+
+    # Assert
+    assert board.find_piece(piece) == to_square
+
+def test_captured_pieces_are_no_longer_on_the_board():
+
+    # Arrange
+    board = Board.empty()
+    rook = Rook(Player.WHITE)
+    pawn = Pawn(Player.BLACK)
+    board.set_piece(Square.at(3, 3), rook)
+    board.set_piece(Square.at(5, 3), pawn)
+
+    # Act
+    board.move_piece(Square.at(3, 3), Square.at(5, 3))
+
+    # Assert
+    assert board.get_pieces(Player.WHITE) == [rook]
+    assert board.get_pieces(Player.BLACK) == []
+    with pytest.raises(Exception):
+        board.find_piece(pawn)
+
+def test_new_board_lists_sixteen_pieces_for_each_player():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    white_pieces = board.get_pieces(Player.WHITE)
+    black_pieces = board.get_pieces(Player.BLACK)
+
+    # Assert
+    assert len(white_pieces) == 16
+    assert len(black_pieces) == 16
+    assert all(piece.player == Player.BLACK for piece in black_pieces)
+
+def test_moves_can_be_unmade():
+
+    # Arrange
+    board = Board.at_starting_position()
+    from_square = Square.at(1, 3)
+    to_square = Square.at(3, 3)
+    piece = board.get_piece(from_square)
+
+    # Act
+    board.make_move(from_square, to_square)
+    board.unmake_move()
+
+    # Assert
+    assert board.get_piece(from_square) is piece
+    assert board.get_piece(to_square) is None
+    assert board.find_piece(piece) == from_square
+    assert board.current_player == Player.WHITE
+
+def test_unmaking_a_capture_restores_the_captured_piece():
+
+    # Arrange
+    board = Board.empty()
+    rook = Rook(Player.WHITE)
+    pawn = Pawn(Player.BLACK)
+    board.set_piece(Square.at(3, 3), rook)
+    board.set_piece(Square.at(5, 3), pawn)
+    occupancy_before = board.get_occupancy()
+
+    # Act
+    board.make_move(Square.at(3, 3), Square.at(5, 3))
+    board.unmake_move()
+
+    # Assert
+    assert board.get_piece(Square.at(3, 3)) is rook
+    assert board.get_piece(Square.at(5, 3)) is pawn
+    assert board.find_piece(pawn) == Square.at(5, 3)
+    assert board.get_occupancy() == occupancy_before
+
+def test_moves_are_unmade_in_reverse_order():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.make_move(Square.at(1, 4), Square.at(3, 4))
+    board.make_move(Square.at(6, 4), Square.at(4, 4))
+    board.unmake_move()
+
+    # Assert
+    assert board.get_piece(Square.at(6, 4)) is not None
+    assert board.get_piece(Square.at(3, 4)) is not None
+    assert board.current_player == Player.BLACK
+
+def test_positions_reached_by_different_move_orders_have_the_same_key():
+
+    # Arrange
+    first = Board.at_starting_position()
+    second = Board.at_starting_position()
+
+    # Act
+    first.move_piece(Square.at(0, 1), Square.at(2, 2))
+    first.move_piece(Square.at(7, 1), Square.at(5, 2))
+    first.move_piece(Square.at(0, 6), Square.at(2, 5))
+
+    second.move_piece(Square.at(0, 6), Square.at(2, 5))
+    second.move_piece(Square.at(7, 1), Square.at(5, 2))
+    second.move_piece(Square.at(0, 1), Square.at(2, 2))
+
+    # Assert
+    assert first.zobrist_key == second.zobrist_key
+
+def test_key_depends_on_the_player_to_move():
+
+    # Arrange
+    board = Board.at_starting_position()
+    key = board.zobrist_key
+
+    # Act
+    board.current_player = Player.BLACK
+
+    # Assert
+    assert board.zobrist_key != key
+
+def test_unmaking_a_move_restores_the_key():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+    key = board.zobrist_key
+
+    # Act
+    board.make_move(Square.at(7, 1), Square.at(5, 2))
+    board.unmake_move()
+
+    # Assert
+    assert board.zobrist_key == key
+
+def test_packed_boards_can_be_unpacked():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Act
+    packed = board.pack()
+    unpacked = Board.unpack(packed)
+
+    # Assert
+    assert len(packed) == 33
+    assert unpacked.zobrist_key == board.zobrist_key
+    assert unpacked.current_player == Player.BLACK
+    assert isinstance(unpacked.get_piece(Square.at(3, 4)), Pawn)
+
+def test_boards_can_be_set_up_from_fen():
+
+    # Act
+    board = Board.from_fen('4k3/8/8/8/8/8/4P3/4K3 b - - 0 1')
+
+    # Assert
+    assert isinstance(board.get_piece(Square.at(1, 4)), Pawn)
+    assert board.get_piece(Square.at(1, 4)).player == Player.WHITE
+    assert board.get_piece(Square.at(7, 4)).player == Player.BLACK
+    assert board.current_player == Player.BLACK
+
+def test_fen_round_trips():
+
+    # Arrange
+    fen = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w - - 0 1'
+
+    # Act
+    board = Board.from_fen(fen)
+
+    # Assert
+    assert board.to_fen() == fen
+
+def test_starting_position_fen():
+
+    # Act
+    fen = Board.at_starting_position().to_fen()
+
+    # Assert
+    assert fen == 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1'
+
+def test_invalid_fen_is_rejected():
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        Board.from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w - - 0 1')
+    with pytest.raises(ValueError):
+        Board.from_fen('rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1')
+    with pytest.raises(ValueError):
+        Board.from_fen('')
+    with pytest.raises(ValueError):
+        Board.from_fen('   ')
+
+def test_unpacked_boards_have_the_same_position():
+
+    # Arrange
+    board = Board.from_fen('r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R b - - 0 1')
+
+    # Act
+    unpacked = Board.unpack(board.pack())
+
+    # Assert
+    assert unpacked.to_fen() == board.to_fen()
+    assert unpacked.piece_square_score == board.piece_square_score
+    assert unpacked.get_moves() == board.get_moves()
+
+def test_kings_cannot_move_into_check():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/r7/4K3 w - - 0 1')
+
+    # Act
+    moves = board.get_legal_moves()
+
+    # Assert
+    assert {to_square.name for _, to_square in moves} == {'d1', 'f1'}
+
+def test_pinned_pieces_can_only_move_along_the_pin():
+
+    # Arrange
+    board = Board.from_fen('4r1k1/8/8/8/8/8/4R3/4K3 w - - 0 1')
+
+    # Act
+    rook_moves = {to_square.name for from_square, to_square in board.get_legal_moves() if from_square.name == 'e2'}
+
+    # Assert
+    assert rook_moves == {'e3', 'e4', 'e5', 'e6', 'e7', 'e8'}
+
+def test_checks_must_be_blocked_or_the_checking_piece_captured():
+
+    # Arrange
+    board = Board.from_fen('4r1k1/8/8/8/8/8/3N4/R3K3 w - - 0 1')
+
+    # Act
+    moves = {(from_square.name, to_square.name) for from_square, to_square in board.get_legal_moves()}
+
+    # Assert
+    assert board.is_in_check()
+    assert ('d2', 'e4') in moves
+    assert ('a1', 'a8') not in moves
+    assert ('e1', 'e2') not in moves
+    assert ('e1', 'd1') in moves
+
+def test_only_the_king_can_move_in_double_check():
+
+    # Arrange
+    board = Board.from_fen('4r1k1/8/8/8/1b6/8/3N4/R3K3 w - - 0 1')
+
+    # Act
+    moves = board.get_legal_moves()
+
+    # Assert
+    assert all(from_square.name == 'e1' for from_square, _ in moves)
+
+def test_checkmate_and_stalemate_are_detected():
+
+    # Arrange
+    checkmate = Board.from_fen('R5k1/5ppp/8/8/8/8/8/6K1 b - - 0 1')
+    stalemate = Board.from_fen('7k/5Q2/6K1/8/8/8/8/8 b - - 0 1')
+
+    # Assert
+    assert checkmate.is_checkmate()
+    assert not checkmate.is_stalemate()
+    assert stalemate.is_stalemate()
+    assert not stalemate.is_checkmate()
+
+def test_attack_map_covers_every_attacked_square():
+
+    # Arrange
+    board = Board.from_fen('8/8/8/8/8/8/8/R3K3 w - - 0 1')
+
+    # Act
+    attacks = board.get_attack_map(Player.WHITE)
+
+    # Assert
+    assert attacks == 0x0101010101010100 | 0b00111110 | 0x3800
+
+def test_pieces_do_not_carry_an_instance_dictionary():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    pieces = board.get_pieces(Player.WHITE) + board.get_pieces(Player.BLACK)
+
+    # Assert
+    assert not any(hasattr(piece, '__dict__') for piece in pieces)
+
+def test_copied_board_can_be_moved_without_changing_the_original():
+
+    # Arrange
+    board = Board.at_starting_position()
+    copy = board.copy()
+
+    # Act
+    copy.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Assert
+    assert board.get_piece(Square.at(3, 4)) is None
+    assert board.to_fen() == Board.at_starting_position().to_fen()
+    assert board.current_player == Player.WHITE
+    assert copy.get_piece(Square.at(3, 4)) is board.get_piece(Square.at(1, 4))
+    assert copy.zobrist_key != board.zobrist_key
+
+def test_copied_board_can_unmake_moves_made_before_copying():
+
+    # Arrange
+    board = Board.at_starting_position()
+    board.make_move(Square.at(0, 6), Square.at(2, 5))
+    copy = board.copy()
+
+    # Act
+    copy.unmake_move()
+
+    # Assert
+    assert copy.zobrist_key == Board.at_starting_position().zobrist_key
+    assert board.get_piece(Square.at(2, 5)) is not None
+
+def shuffle_knights(board, times):
+    for _ in range(times):
+        board.move_piece(Square.at(0, 6), Square.at(2, 5))
+        board.move_piece(Square.at(7, 6), Square.at(5, 5))
+        board.move_piece(Square.at(2, 5), Square.at(0, 6))
+        board.move_piece(Square.at(5, 5), Square.at(7, 6))
+
+def test_position_repeated_three_times_is_a_draw():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    shuffle_knights(board, 2)
+
+    # Assert
+    assert board.is_repetition()
+    assert board.is_threefold_repetition()
+
+def test_position_repeated_twice_is_not_yet_a_draw():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    shuffle_knights(board, 1)
+
+    # Assert
+    assert board.is_repetition()
+    assert not board.is_threefold_repetition()
+
+def test_pawn_moves_reset_the_halfmove_clock_and_repetitions():
+
+    # Arrange
+    board = Board.at_starting_position()
+    shuffle_knights(board, 1)
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+
+    # Assert
+    assert board.halfmove_clock == 0
+    assert not board.is_repetition()
+
+def test_unmaking_a_move_restores_the_move_counters():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/4P3/R3K3 b - - 12 30')
+
+    # Act
+    board.make_move(Square.at(7, 4), Square.at(7, 3))
+    after_move = board.to_fen()
+    board.unmake_move()
+
+    # Assert
+    assert after_move == '3k4/8/8/8/8/8/4P3/R3K3 w - - 13 31'
+    assert board.to_fen() == '4k3/8/8/8/8/8/4P3/R3K3 b - - 12 30'
+
+def test_hundred_moves_without_pawn_move_or_capture_is_a_draw():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/8/R3K3 w - - 99 80')
+
+    # Act
+    board.move_piece(Square.at(0, 0), Square.at(1, 0))
+
+    # Assert
+    assert board.is_fifty_move_draw()
+
+def test_legal_moves_do_not_depend_on_shared_square_instances():
+
+    # Arrange
+    board = Board.empty()
+    king = King(Player.WHITE)
+    board.set_piece(Square(0, 4), king)
+    board.set_piece(Square(1, 0), Rook(Player.BLACK))
+
+    # Act
+    moves = board.get_legal_moves()
+
+    # Assert
+    assert sorted(to_square.name for _, to_square in moves) == ['d1', 'f1']
+    assert board.find_piece(king) is Square.at(0, 4)
+
+def test_unpacked_boards_keep_the_history_they_are_given():
+
+    # Arrange
+    board = Board.at_starting_position()
+    shuffle_knights(board, 2)
+
+    # Act
+    unpacked = Board.unpack(board.pack(), board.halfmove_clock, board.repetition_history())
+
+    # Assert
+    assert unpacked.is_threefold_repetition()
+    assert unpacked.halfmove_clock == 8
+    assert not Board.unpack(board.pack()).is_repetition()
@@ -0,0 +1,48 @@
+from chessington.engine.data import Square, SQUARES
+
+def test_squares_on_the_board_are_shared():
+
+    # Act
+    first = Square.at(3, 5)
+    second = Square.at(3, 5)
+
+    # Assert
+    assert first is second
+    assert first is Square.from_index(29)
+
+def test_squares_have_their_bit_index():
+
+    # Act
+    square = Square.at(6, 2)
+
+    # Assert
+    assert square.index == 50
+    assert SQUARES[square.index] is square
+
+def test_constructed_squares_equal_shared_squares():
+
+    # Act
+    square = Square(4, 7)
+
+    # Assert
+    assert square == Square.at(4, 7)
+    assert hash(square) == hash(Square.at(4, 7))
+    assert square in {Square.at(4, 7)}
+
+def test_squares_off_the_board_can_still_be_created():
+
+    # Act
+    square = Square.at(8, 3)
+
+    # Assert
+    assert square.row == 8
+    assert square not in SQUARES
+
+def test_squares_can_be_named():
+
+    # Act
+    square = Square.from_name('e4')
+
+    # Assert
+    assert square is Square.at(3, 4)
+    assert square.name == 'e4'
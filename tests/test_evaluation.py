@@ -0,0 +1,80 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.engine.evaluation import PawnCache, evaluate, pawn_structure
+
+def test_starting_position_is_level():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    score = evaluate(board)
+
+    # Assert
+    assert score == 0
+
+def test_scores_are_kept_up_to_date_as_pieces_move():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    board.move_piece(Square.at(1, 4), Square.at(3, 4))
+    board.move_piece(Square.at(6, 3), Square.at(4, 3))
+    board.move_piece(Square.at(3, 4), Square.at(4, 3))
+
+    # Assert
+    rebuilt = Board.unpack(board.pack())
+    assert board.piece_square_score == rebuilt.piece_square_score
+    assert board.piece_square_score > 100
+
+def test_score_is_from_the_point_of_view_of_the_player_to_move():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/8/3QK3 w')
+
+    # Act
+    white_score = evaluate(board)
+    board.current_player = Player.BLACK
+    black_score = evaluate(board)
+
+    # Assert
+    assert white_score > 800
+    assert black_score == -white_score
+
+def test_doubled_and_isolated_pawns_are_penalised():
+
+    # Arrange
+    healthy = Board.from_fen('4k3/8/8/8/8/8/2PP4/4K3 w')
+    doubled = Board.from_fen('4k3/8/8/8/8/2P5/2P5/4K3 w')
+
+    # Act
+    healthy_score = pawn_structure(healthy.get_occupancy(Player.WHITE) & ~(1 << 4), 0)
+    doubled_score = pawn_structure(doubled.get_occupancy(Player.WHITE) & ~(1 << 4), 0)
+
+    # Assert
+    assert doubled_score < healthy_score
+
+def test_passed_pawns_are_rewarded_more_the_further_they_are_advanced():
+
+    # Act
+    blocked = pawn_structure(1 << Square.at(4, 3).index, 1 << Square.at(6, 3).index)
+    passed = pawn_structure(1 << Square.at(4, 3).index, 1 << Square.at(6, 6).index)
+    further = pawn_structure(1 << Square.at(5, 3).index, 1 << Square.at(6, 6).index)
+
+    # Assert
+    assert passed > blocked
+    assert further > passed
+
+def test_pawn_cache_returns_the_computed_score():
+
+    # Arrange
+    cache = PawnCache(size=16)
+    white_pawns, black_pawns = 0x000000000000FF00, 0x00FF000000000000
+
+    # Act
+    first = cache.score(white_pawns, black_pawns)
+    second = cache.score(white_pawns, black_pawns)
+
+    # Assert
+    assert first == second == pawn_structure(white_pawns, black_pawns)
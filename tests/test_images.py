@@ -0,0 +1,85 @@
+import importlib
+import os
+
+import pytest
+
+pytest.importorskip('PIL')
+pytest.importorskip('tkinter')
+
+# chessington.ui has an attribute called images, so the module is looked up by name
+images = importlib.import_module('chessington.ui.images')
+
+@pytest.fixture
+def atlas_filename(tmp_path):
+    return str(tmp_path / 'atlas.png')
+
+def test_freshly_built_atlas_is_current(atlas_filename):
+
+    # Act
+    images.build_atlas(atlas_filename)
+
+    # Assert
+    assert images.atlas_is_current(atlas_filename)
+    assert not os.path.exists(atlas_filename + '.tmp')
+
+def test_missing_atlas_is_not_current(atlas_filename):
+
+    # Assert
+    assert not images.atlas_is_current(atlas_filename)
+
+def test_atlas_older_than_a_piece_image_is_stale(atlas_filename):
+
+    # Arrange
+    images.build_atlas(atlas_filename)
+    newest_source = max(os.path.getmtime(source) for source in images._atlas_sources())
+
+    # Act
+    os.utime(atlas_filename, (newest_source - 10, newest_source - 10))
+
+    # Assert
+    assert not images.atlas_is_current(atlas_filename)
+
+def test_atlas_with_a_different_layout_is_stale(atlas_filename, monkeypatch):
+
+    # Arrange
+    images.build_atlas(atlas_filename)
+
+    # Act
+    monkeypatch.setattr(images, 'ATLAS_SPRITES', images.ATLAS_SPRITES[::-1])
+
+    # Assert
+    assert not images.atlas_is_current(atlas_filename)
+
+def test_atlas_that_cannot_be_saved_is_kept_in_memory(tmp_path):
+
+    # Arrange
+    atlas_filename = str(tmp_path / 'missing' / 'atlas.png')
+
+    # Act
+    atlas = images.build_atlas(atlas_filename)
+
+    # Assert
+    assert atlas.size[0] % len(images.ATLAS_SPRITES) == 0
+    assert atlas.size[1] % len(images.ATLAS_COLOURS) == 0
+    assert not os.path.exists(atlas_filename)
+
+def test_repository_builds_the_atlas_once_and_then_reuses_it(atlas_filename, monkeypatch):
+
+    # Arrange
+    built = []
+    build_atlas = images.build_atlas
+
+    def counting_build_atlas(filename):
+        built.append(filename)
+        return build_atlas(filename)
+
+    monkeypatch.setattr(images, 'build_atlas', counting_build_atlas)
+
+    # Act
+    first = images.ImageRepository(atlas_filename)._get_atlas()
+    second = images.ImageRepository(atlas_filename)._get_atlas()
+
+    # Assert
+    assert built == [atlas_filename]
+    assert second.size == first.size
+    assert second.tobytes() == first.tobytes()
@@ -0,0 +1,76 @@
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.perft import REFERENCE_POSITIONS, divide, main, parallel_perft, perft
+
+@pytest.mark.parametrize('position', REFERENCE_POSITIONS, ids=lambda position: position.name)
+def test_reference_positions_have_the_expected_counts(position):
+
+    # Arrange
+    board = Board.from_fen(position.fen)
+
+    # Act
+    counts = [perft(board, depth) for depth in range(1, 3)]
+
+    # Assert
+    assert counts == position.counts[:2]
+
+def test_perft_leaves_the_board_unchanged():
+
+    # Arrange
+    board = Board.from_fen(REFERENCE_POSITIONS[1].fen)
+    key = board.zobrist_key
+
+    # Act
+    perft(board, 3)
+
+    # Assert
+    assert board.zobrist_key == key
+
+def test_divide_splits_the_count_by_first_move():
+
+    # Arrange
+    board = Board.from_fen(REFERENCE_POSITIONS[0].fen)
+
+    # Act
+    counts = divide(board, 2)
+
+    # Assert
+    assert len(counts) == 20
+    assert sum(counts.values()) == 400
+    assert counts[Square.at(1, 4), Square.at(3, 4)] == 20
+
+def test_parallel_perft_matches_perft():
+
+    # Arrange
+    board = Board.from_fen(REFERENCE_POSITIONS[1].fen)
+
+    # Act
+    result = parallel_perft(board, 3, workers=2, split_depth=2)
+
+    # Assert
+    assert result.nodes == REFERENCE_POSITIONS[1].counts[2]
+    assert result.divide == divide(board, 3)
+    assert sum(stats.nodes for stats in result.workers.values()) == result.nodes
+
+def test_parallel_perft_keeps_moves_that_end_the_game_before_the_split():
+
+    # Arrange
+    board = Board.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+
+    # Act
+    result = parallel_perft(board, 2, workers=2, split_depth=2)
+
+    # Assert
+    assert result.divide == divide(board, 2)
+    assert result.divide[Square.at(0, 0), Square.at(7, 0)] == 0
+
+def test_suite_passes_from_the_command_line(capsys):
+
+    # Act
+    status = main(['--suite', '2'])
+
+    # Assert
+    assert status == 0
+    assert 'FAILED' not in capsys.readouterr().out
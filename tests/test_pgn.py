@@ -0,0 +1,143 @@
+import io
+
+import pytest
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.pgn import PgnError, read_games, replay, replay_file, replay_games, resolve_san
+
+SCHOLARS_MATE = '''[Event "Casual game"]
+[White "Alice"]
+[Black "Bob"]
+[Result "1-0"]
+
+1. e4 e5 2. Bc4 {attacking f7} Nc6 3. Qh5 Nf6?? (3... g6 4. Qf3) 4. Qxf7# 1-0
+'''
+
+CASTLING_GAME = '''[Event "Casual game"]
+[Result "*"]
+
+1. e4 e5 2. Nf3 Nc6 3. Bc4 Bc5 4. O-O *
+'''
+
+NONSENSE_GAME = '''[Event "Casual game"]
+[Result "*"]
+
+1. e4 e5 2. Zz9 *
+'''
+
+INTO_CHECK_GAME = '''[Event "Casual game"]
+[FEN "4k3/8/8/8/8/8/4r3/4K3 w - - 0 1"]
+[Result "*"]
+
+1. Kf2 *
+'''
+
+PINNED_KNIGHT_GAME = '''[Event "Casual game"]
+[FEN "4k3/4r3/8/8/8/8/4N3/4K3 w - - 0 1"]
+[Result "*"]
+
+1. Nc3 *
+'''
+
+def test_games_are_read_with_their_tags_and_moves():
+
+    # Act
+    games = list(read_games(io.StringIO(SCHOLARS_MATE)))
+
+    # Assert
+    assert len(games) == 1
+    assert games[0].tags['White'] == 'Alice'
+    assert games[0].moves == ['e4', 'e5', 'Bc4', 'Nc6', 'Qh5', 'Nf6??', 'Qxf7#']
+    assert games[0].result == '1-0'
+
+def test_games_are_read_one_at_a_time():
+
+    # Arrange
+    lines = io.StringIO(SCHOLARS_MATE + '\n' + CASTLING_GAME)
+
+    # Act
+    games = read_games(lines)
+    first = next(games)
+
+    # Assert
+    assert first.result == '1-0'
+    assert next(games).moves[-1] == 'O-O'
+
+def test_san_moves_are_resolved_against_the_board():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/4K3/R6R w - - 0 1')
+
+    # Act
+    move = resolve_san(board, 'Rhf1')
+
+    # Assert
+    assert move == (Square.from_name('h1'), Square.from_name('f1'))
+
+def test_ambiguous_san_moves_are_rejected():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/8/8/8/4K3/R6R w - - 0 1')
+
+    # Act / Assert
+    with pytest.raises(PgnError):
+        resolve_san(board, 'Rf1')
+
+def test_illegal_san_moves_are_rejected_even_without_a_rival():
+
+    # Arrange
+    board = Board.from_fen('4k3/4r3/8/8/8/8/4N3/4K3 w - - 0 1')
+
+    # Act / Assert
+    with pytest.raises(PgnError):
+        resolve_san(board, 'Nc3')
+
+def test_games_are_replayed_to_their_final_position():
+
+    # Arrange
+    game = next(read_games(io.StringIO(SCHOLARS_MATE)))
+
+    # Act
+    board = replay(game)
+
+    # Assert
+    assert board.to_fen() == 'r1bqkb1r/pppp1Qpp/2n2n2/4p3/2B1P3/8/PPPP1PPP/RNB1K1NR b - - 0 4'
+
+def test_unplayable_games_are_skipped():
+
+    # Arrange
+    lines = io.StringIO(CASTLING_GAME + '\n' + NONSENSE_GAME + '\n' + SCHOLARS_MATE)
+
+    # Act
+    stats = replay_games(lines)
+
+    # Assert
+    assert stats.games == 1
+    assert stats.skipped == 2
+    assert stats.plies == 7
+
+def test_games_with_illegal_moves_are_skipped():
+
+    # Arrange
+    lines = io.StringIO(INTO_CHECK_GAME + '\n' + PINNED_KNIGHT_GAME + '\n' + SCHOLARS_MATE)
+
+    # Act
+    stats = replay_games(lines)
+
+    # Assert
+    assert stats.games == 1
+    assert stats.skipped == 2
+
+def test_files_are_replayed_in_chunks_across_processes(tmp_path):
+
+    # Arrange
+    path = tmp_path / 'games.pgn'
+    path.write_text((SCHOLARS_MATE + '\n' + NONSENSE_GAME + '\n') * 20)
+
+    # Act
+    stats = replay_file(str(path), workers=2, chunk_size=500)
+
+    # Assert
+    assert stats.games == 20
+    assert stats.skipped == 20
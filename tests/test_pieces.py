@@ -1,6 +1,6 @@
 from chessington.engine.board import Board
 from chessington.engine.data import Player, Square
-from chessington.engine.pieces import Pawn
+from chessington.engine.pieces import Pawn, Knight, Bishop, Rook, Queen
 
 class TestPawns:
 
@@ -310,4 +310,202 @@ class TestPawns:
 
         # Assert
         assert Square.at(4, 3) not in moves
-        assert Square.at(4, 5) not in moves
\ No newline at end of file
+        assert Square.at(4, 5) not in moves
+
+class TestKnights:
+
+    @staticmethod
+    def test_knights_can_jump_in_an_l_shape():
+
+        # Arrange
+        board = Board.empty()
+        knight = Knight(Player.WHITE)
+        square = Square.at(4, 4)
+        board.set_piece(square, knight)
+
+        # Act
+        moves = knight.get_available_moves(board)
+
+        # Assert
+        assert set(moves) == {
+            Square.at(6, 5), Square.at(6, 3), Square.at(2, 5), Square.at(2, 3),
+            Square.at(5, 6), Square.at(5, 2), Square.at(3, 6), Square.at(3, 2),
+        }
+
+    @staticmethod
+    def test_knights_cannot_jump_off_the_board():
+
+        # Arrange
+        board = Board.empty()
+        knight = Knight(Player.BLACK)
+        square = Square.at(0, 0)
+        board.set_piece(square, knight)
+
+        # Act
+        moves = knight.get_available_moves(board)
+
+        # Assert
+        assert set(moves) == {Square.at(2, 1), Square.at(1, 2)}
+
+    @staticmethod
+    def test_knights_can_jump_over_pieces():
+
+        # Arrange
+        board = Board.at_starting_position()
+        knight = board.get_piece(Square.at(0, 1))
+
+        # Act
+        moves = knight.get_available_moves(board)
+
+        # Assert
+        assert set(moves) == {Square.at(2, 0), Square.at(2, 2)}
+
+    @staticmethod
+    def test_knights_can_capture_enemy_pieces_but_not_friendly_pieces():
+
+        # Arrange
+        board = Board.empty()
+        knight = Knight(Player.WHITE)
+        board.set_piece(Square.at(4, 4), knight)
+
+        enemy_square = Square.at(6, 5)
+        board.set_piece(enemy_square, Pawn(Player.BLACK))
+
+        friendly_square = Square.at(6, 3)
+        board.set_piece(friendly_square, Pawn(Player.WHITE))
+
+        # Act
+        moves = knight.get_available_moves(board)
+
+        # Assert
+        assert enemy_square in moves
+        assert friendly_square not in moves
+
+
+class TestBishops:
+
+    @staticmethod
+    def test_bishops_can_move_diagonally():
+
+        # Arrange
+        board = Board.empty()
+        bishop = Bishop(Player.WHITE)
+        board.set_piece(Square.at(0, 2), bishop)
+
+        # Act
+        moves = bishop.get_available_moves(board)
+
+        # Assert
+        assert set(moves) == {
+            Square.at(1, 1), Square.at(2, 0),
+            Square.at(1, 3), Square.at(2, 4), Square.at(3, 5), Square.at(4, 6), Square.at(5, 7),
+        }
+
+    @staticmethod
+    def test_bishops_are_blocked_by_pieces_and_can_capture_enemies():
+
+        # Arrange
+        board = Board.empty()
+        bishop = Bishop(Player.WHITE)
+        board.set_piece(Square.at(3, 3), bishop)
+
+        board.set_piece(Square.at(5, 5), Pawn(Player.BLACK))
+        board.set_piece(Square.at(1, 1), Pawn(Player.WHITE))
+
+        # Act
+        moves = bishop.get_available_moves(board)
+
+        # Assert
+        assert Square.at(4, 4) in moves
+        assert Square.at(5, 5) in moves
+        assert Square.at(6, 6) not in moves
+        assert Square.at(2, 2) in moves
+        assert Square.at(1, 1) not in moves
+        assert Square.at(0, 0) not in moves
+
+
+class TestRooks:
+
+    @staticmethod
+    def test_rooks_can_move_along_rows_and_columns():
+
+        # Arrange
+        board = Board.empty()
+        rook = Rook(Player.BLACK)
+        board.set_piece(Square.at(4, 4), rook)
+
+        # Act
+        moves = rook.get_available_moves(board)
+
+        # Assert
+        assert len(moves) == 14
+        assert all(square.row == 4 or square.col == 4 for square in moves)
+
+    @staticmethod
+    def test_rooks_are_blocked_by_pieces_and_can_capture_enemies():
+
+        # Arrange
+        board = Board.empty()
+        rook = Rook(Player.BLACK)
+        board.set_piece(Square.at(4, 4), rook)
+
+        board.set_piece(Square.at(4, 1), Pawn(Player.WHITE))
+        board.set_piece(Square.at(6, 4), Pawn(Player.BLACK))
+
+        # Act
+        moves = rook.get_available_moves(board)
+
+        # Assert
+        assert Square.at(4, 1) in moves
+        assert Square.at(4, 0) not in moves
+        assert Square.at(5, 4) in moves
+        assert Square.at(6, 4) not in moves
+
+    @staticmethod
+    def test_rooks_cannot_move_at_the_start_of_the_game():
+
+        # Arrange
+        board = Board.at_starting_position()
+        rook = board.get_piece(Square.at(0, 0))
+
+        # Act
+        moves = rook.get_available_moves(board)
+
+        # Assert
+        assert len(moves) == 0
+
+
+class TestQueens:
+
+    @staticmethod
+    def test_queens_can_move_like_rooks_and_bishops():
+
+        # Arrange
+        board = Board.empty()
+        queen = Queen(Player.WHITE)
+        board.set_piece(Square.at(3, 3), queen)
+
+        # Act
+        moves = queen.get_available_moves(board)
+
+        # Assert
+        assert len(moves) == 27
+        assert Square.at(3, 7) in moves
+        assert Square.at(7, 7) in moves
+        assert Square.at(0, 6) in moves
+
+    @staticmethod
+    def test_queens_are_blocked_by_friendly_pieces():
+
+        # Arrange
+        board = Board.empty()
+        queen = Queen(Player.WHITE)
+        board.set_piece(Square.at(3, 3), queen)
+        board.set_piece(Square.at(4, 4), Pawn(Player.WHITE))
+
+        # Act
+        moves = queen.get_available_moves(board)
+
+        # Assert
+        assert Square.at(4, 4) not in moves
+        assert Square.at(5, 5) not in moves
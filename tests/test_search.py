@@ -0,0 +1,92 @@
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.engine.search import MATE_SCORE, Search, choose_move
+
+def test_search_finds_mate_in_one():
+
+    # Arrange
+    board = Board.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w')
+
+    # Act
+    result = Search(board).run(max_depth=3)
+
+    # Assert
+    assert result.move == (Square.at(0, 0), Square.at(7, 0))
+    assert result.score == MATE_SCORE - 1
+
+def test_search_captures_an_undefended_queen():
+
+    # Arrange
+    board = Board.from_fen('4k3/8/8/3q4/8/8/3R4/4K3 w')
+
+    # Act
+    move = choose_move(board, max_depth=3)
+
+    # Assert
+    assert move == (Square.at(1, 3), Square.at(4, 3))
+
+def test_search_has_no_move_in_stalemate():
+
+    # Arrange
+    board = Board.from_fen('7k/5Q2/6K1/8/8/8/8/8 b')
+
+    # Act
+    result = Search(board).run(max_depth=2)
+
+    # Assert
+    assert result is None
+
+def test_search_prefers_mate_to_stalemate():
+
+    # Arrange
+    board = Board.from_fen('7k/4Q3/6K1/8/8/8/8/8 w')
+
+    # Act
+    result = Search(board).run(max_depth=3)
+
+    # Assert
+    assert result.move != (Square.at(6, 4), Square.at(6, 5))
+    assert result.score == MATE_SCORE - 1
+
+def test_search_leaves_the_board_unchanged():
+
+    # Arrange
+    board = Board.from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w')
+    key = board.zobrist_key
+
+    # Act
+    Search(board).run(max_depth=3)
+
+    # Assert
+    assert board.zobrist_key == key
+    assert len(board.get_moves()) == 20
+
+def test_search_stops_within_its_node_budget():
+
+    # Arrange
+    board = Board.from_fen('rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w')
+    iterations = []
+
+    # Act
+    result = Search(board).run(node_limit=100, on_iteration=iterations.append)
+
+    # Assert
+    assert result.move in board.get_moves()
+    assert result.nodes <= 100
+    assert [iteration.depth for iteration in iterations] == list(range(1, len(iterations) + 1))
+
+def test_search_stopped_before_it_starts_returns_straight_away():
+
+    # Arrange
+    board = Board.at_starting_position()
+    search = Search(board)
+    search.stop()
+
+    # Act
+    stopped = search.run(max_depth=64)
+    unstopped = search.run(max_depth=2)
+
+    # Assert
+    assert stopped.depth == 0
+    assert stopped.move in board.get_legal_moves()
+    assert unstopped.depth == 2
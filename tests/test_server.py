@@ -0,0 +1,168 @@
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+from chessington.server import GameClient, GameServer, RequestError, start_server
+
+def run_with_client(scenario, unix=False, workers=1):
+    async def run():
+        game_server = GameServer(workers)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'chessington.sock') if unix else None
+            server = await start_server(game_server, port=0, path=path)
+            port = None if unix else server.sockets[0].getsockname()[1]
+            client = await GameClient.connect(port=port, path=path)
+            try:
+                return await scenario(client)
+            finally:
+                await client.close()
+                server.close()
+                await server.wait_closed()
+                game_server.close()
+
+    return asyncio.run(run())
+
+def test_moves_are_played_in_a_session():
+
+    # Arrange
+    async def scenario(client):
+        session = await client.new_game()
+
+        # Act
+        await client.move(session, 'e2e4')
+        return await client.state(session)
+
+    state = run_with_client(scenario)
+
+    # Assert
+    assert state['fen'] == 'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - - 0 1'
+    assert state['player'] == 'black'
+    assert len(state['moves']) == 20
+
+def test_illegal_moves_are_rejected():
+
+    # Arrange
+    async def scenario(client):
+        session = await client.new_game()
+
+        # Act
+        with pytest.raises(RequestError, match='Illegal move'):
+            await client.move(session, 'e2e5')
+        return await client.state(session)
+
+    state = run_with_client(scenario)
+
+    # Assert
+    assert state['player'] == 'white'
+
+def test_sessions_are_independent():
+
+    # Arrange
+    async def scenario(client):
+        first, second = await client.new_game(), await client.new_game()
+
+        # Act
+        await asyncio.gather(client.move(first, 'e2e4'), client.move(second, 'd2d4'))
+        return await client.state(first), await client.state(second)
+
+    first, second = run_with_client(scenario)
+
+    # Assert
+    assert first['fen'].startswith('rnbqkbnr/pppppppp/8/8/4P3/')
+    assert second['fen'].startswith('rnbqkbnr/pppppppp/8/8/3P4/')
+
+def test_checkmate_is_reported():
+
+    # Arrange
+    async def scenario(client):
+        session = await client.new_game('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+
+        # Act
+        return await client.move(session, 'a1a8')
+
+    reply = run_with_client(scenario)
+
+    # Assert
+    assert reply['status'] == 'checkmate'
+
+def test_engine_plays_a_move_from_the_process_pool():
+
+    # Arrange
+    async def scenario(client):
+        session = await client.new_game('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+
+        # Act
+        return await client.engine_move(session, time=0.5, play=True)
+
+    reply = run_with_client(scenario)
+
+    # Assert
+    assert reply['move'] == 'a1a8'
+    assert reply['status'] == 'checkmate'
+
+def test_stats_report_sessions_memory_and_latency():
+
+    # Arrange
+    async def scenario(client):
+        session = await client.new_game()
+        await client.move(session, 'g1f3')
+
+        # Act
+        return await client.stats()
+
+    stats = run_with_client(scenario)
+
+    # Assert
+    assert stats['sessions'] == 1
+    assert stats['session_memory_bytes'] > 0
+    assert stats['moves_validated'] == 1
+    assert stats['move_validation_p99_ms'] > 0
+
+def test_closed_sessions_are_forgotten():
+
+    # Arrange
+    async def scenario(client):
+        session = await client.new_game()
+
+        # Act
+        await client.close_game(session)
+        with pytest.raises(RequestError, match='No such session'):
+            await client.state(session)
+        return await client.stats()
+
+    stats = run_with_client(scenario)
+
+    # Assert
+    assert stats['sessions'] == 0
+
+def test_server_listens_on_unix_sockets():
+
+    # Arrange
+    async def scenario(client):
+
+        # Act
+        return await client.new_game()
+
+    session = run_with_client(scenario, unix=True)
+
+    # Assert
+    assert session
+
+def test_engine_sees_draws_by_repetition():
+
+    # Arrange
+    async def scenario(client):
+        session = await client.new_game('q6k/8/8/8/8/7K/8/1N6 w - - 0 1')
+        for move in ['b1c3', 'a8a7', 'c3b1', 'a7a8'] * 2 + ['b1c3', 'a8a7']:
+            await client.move(session, move)
+
+        # Act
+        return await client.engine_move(session, time=0.5)
+
+    reply = run_with_client(scenario)
+
+    # Assert
+    # White is a queen down, so repeating the position for a draw is its best move
+    assert reply['move'] == 'c3b1'
@@ -0,0 +1,134 @@
+import heapq
+import itertools
+import subprocess
+import sys
+import time
+
+import pytest
+
+pytest.importorskip('PIL')
+pytest.importorskip('tkinter')
+
+from chessington.engine.board import Board
+from chessington.engine.data import Square
+from chessington.ui.thinking import BackgroundSearch
+
+class StandInWindow:
+    """
+    Runs callbacks scheduled with after, in place of a Tk window's main loop.
+    """
+
+    def __init__(self):
+        self._scheduled = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+
+    def after(self, milliseconds, callback):
+        callback_id = next(self._ids)
+        heapq.heappush(self._scheduled, (time.perf_counter() + milliseconds / 1000, callback_id, callback))
+        return callback_id
+
+    def after_cancel(self, callback_id):
+        self._cancelled.add(callback_id)
+
+    def run(self, seconds):
+        deadline = time.perf_counter() + seconds
+        while self._scheduled and time.perf_counter() < deadline:
+            due, callback_id, callback = heapq.heappop(self._scheduled)
+            time.sleep(max(0, due - time.perf_counter()))
+            if callback_id not in self._cancelled:
+                callback()
+
+@pytest.fixture
+def window():
+    return StandInWindow()
+
+@pytest.fixture
+def engine(window):
+    engine = BackgroundSearch(window, time_limit=30.0)
+    yield engine
+    engine.close()
+
+def test_stopped_search_returns_its_best_move_so_far(window, engine):
+
+    # Arrange
+    board = Board.at_starting_position()
+    moves = []
+    engine.start(board, moves.append)
+    window.after(200, engine.stop)
+
+    # Act
+    start = time.perf_counter()
+    window.run(10)
+    seconds = time.perf_counter() - start
+
+    # Assert
+    assert len(moves) == 1
+    assert moves[0] in board.get_legal_moves()
+    assert seconds < 5
+    assert not engine.thinking
+
+def test_cancelled_search_never_calls_back(window, engine):
+
+    # Arrange
+    moves = []
+    engine.start(Board.at_starting_position(), moves.append)
+
+    # Act
+    window.after(100, engine.cancel)
+    window.run(1)
+
+    # Assert
+    assert moves == []
+    assert not engine.thinking
+
+def test_search_can_start_again_after_cancelling(window, engine):
+
+    # Arrange
+    first, second = [], []
+    board = Board.at_starting_position()
+    engine.start(board, first.append)
+    window.after(100, engine.cancel)
+    window.after(150, lambda: engine.start(board, second.append))
+    window.after(400, engine.stop)
+
+    # Act
+    window.run(10)
+
+    # Assert
+    assert first == []
+    assert len(second) == 1
+    assert second[0] in board.get_legal_moves()
+
+def test_search_sees_draws_by_repetition(window):
+
+    # Arrange
+    board = Board.from_fen('q6k/8/8/8/8/7K/8/1N6 w - - 0 1')
+    for move in ['b1c3', 'a8a7', 'c3b1', 'a7a8'] * 2 + ['b1c3', 'a8a7']:
+        board.move_piece(Square.from_name(move[:2]), Square.from_name(move[2:]))
+    engine = BackgroundSearch(window, time_limit=0.5)
+    moves = []
+
+    # Act
+    try:
+        engine.start(board, moves.append)
+        window.run(10)
+    finally:
+        engine.close()
+
+    # Assert
+    # White is a queen down, so repeating the position for a draw is its best move
+    assert moves == [(Square.from_name('c3'), Square.from_name('b1'))]
+
+def test_importing_the_gui_does_not_load_the_search_or_worker_pool():
+
+    # Arrange
+    code = ('import sys, chessington.ui; '
+            'print([name for name in ("multiprocessing", "concurrent.futures", "chessington.engine.search") '
+            'if name in sys.modules])')
+
+    # Act
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+
+    # Assert
+    assert output.strip() == '[]'
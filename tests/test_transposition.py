@@ -0,0 +1,67 @@
+from chessington.engine.data import Square
+from chessington.engine.transposition import Bound, TranspositionTable
+
+def test_stored_entries_can_be_probed():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+    move = (Square.at(1, 4), Square.at(3, 4))
+
+    # Act
+    table.store(0x1234, 5, -42, Bound.LOWER, move)
+    entry = table.probe(0x1234)
+
+    # Assert
+    assert entry == (5, -42, Bound.LOWER, move)
+    assert table.hits == 1
+
+def test_missing_entries_are_counted_as_misses():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+
+    # Act
+    entry = table.probe(0x1234)
+
+    # Assert
+    assert entry is None
+    assert table.misses == 1
+    assert table.collisions == 0
+
+def test_table_size_is_bounded_by_the_memory_budget():
+
+    # Act
+    table = TranspositionTable(size_mb=1)
+
+    # Assert
+    assert len(table) * 16 <= 1024 * 1024
+
+def test_deeper_entries_are_kept_when_a_bucket_is_full():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+    bucket_count = len(table) // 2
+    deep_key, first_shallow_key, second_shallow_key = 7, 7 + bucket_count, 7 + 2 * bucket_count
+
+    # Act
+    table.store(deep_key, 8, 10, Bound.EXACT)
+    table.store(first_shallow_key, 2, 20, Bound.EXACT)
+    table.store(second_shallow_key, 1, 30, Bound.EXACT)
+
+    # Assert
+    assert table.probe(deep_key) is not None
+    assert table.probe(first_shallow_key) is None
+    assert table.probe(second_shallow_key) is not None
+    assert table.collisions == 1
+
+def test_clearing_forgets_entries():
+
+    # Arrange
+    table = TranspositionTable(size_mb=1)
+    table.store(99, 3, 0, Bound.UPPER)
+
+    # Act
+    table.clear()
+
+    # Assert
+    assert table.probe(99) is None
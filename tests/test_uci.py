@@ -0,0 +1,108 @@
+import io
+import subprocess
+import sys
+
+from chessington.engine.board import Board
+from chessington.engine.data import Player, Square
+from chessington.uci import UciEngine, move_from_uci, move_to_uci
+
+def run_commands(*commands):
+    output = io.StringIO()
+    engine = UciEngine(output)
+    for command in commands:
+        engine.handle(command)
+    engine.wait()
+    return engine, output.getvalue().splitlines()
+
+def test_engine_identifies_itself():
+
+    # Act
+    _, lines = run_commands('uci', 'isready')
+
+    # Assert
+    assert lines[0].startswith('id name')
+    assert lines[-2:] == ['uciok', 'readyok']
+
+def test_moves_are_played_from_the_starting_position():
+
+    # Act
+    engine, _ = run_commands('position startpos moves e2e4 e7e5 g1f3')
+
+    # Assert
+    assert engine.board.current_player == Player.BLACK
+    assert engine.board.get_piece(Square.from_name('f3')) is not None
+
+def test_illegal_moves_leave_the_position_unchanged():
+
+    # Act
+    engine, lines = run_commands('position startpos moves e2e5')
+
+    # Assert
+    assert engine.board.to_fen() == Board.at_starting_position().to_fen()
+    assert lines == ['info string Illegal move: e2e5']
+
+def test_search_to_a_depth_reports_progress_and_a_best_move():
+
+    # Act
+    _, lines = run_commands('position fen 6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1', 'go depth 3')
+
+    # Assert
+    assert any(line.startswith('info depth 1 ') and ' nps ' in line for line in lines)
+    assert 'score mate 1' in lines[-2]
+    assert lines[-1] == 'bestmove a1a8'
+
+def test_infinite_search_gives_its_move_when_stopped():
+
+    # Arrange
+    output = io.StringIO()
+    engine = UciEngine(output)
+    engine.handle('go infinite')
+
+    # Act
+    engine.handle('stop')
+
+    # Assert
+    assert output.getvalue().splitlines()[-1].startswith('bestmove ')
+
+def test_moves_are_written_in_long_algebraic_notation():
+
+    # Arrange
+    board = Board.at_starting_position()
+
+    # Act
+    move = move_from_uci(board, 'g1f3')
+
+    # Assert
+    assert move == (Square.at(0, 6), Square.at(2, 5))
+    assert move_to_uci(move) == 'g1f3'
+
+def test_uci_does_not_import_the_gui():
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, '-c', 'import sys, chessington.uci; print(sorted(m for m in sys.modules if m.startswith(("PIL", "tkinter", "chessington.ui"))))'],
+        stdout=subprocess.PIPE, universal_newlines=True, check=True)
+
+    # Assert
+    assert result.stdout.strip() == '[]'
+
+def test_position_without_a_fen_is_reported_and_ignored():
+
+    # Act
+    engine, lines = run_commands('position fen')
+
+    # Assert
+    assert engine.board.to_fen() == Board.at_starting_position().to_fen()
+    assert lines[0].startswith('info string')
+
+def test_engine_keeps_reading_after_a_bad_command():
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, '-m', 'chessington.uci'], input='position fen\nisready\nquit\n',
+        stdout=subprocess.PIPE, universal_newlines=True, check=True)
+
+    # Assert
+    lines = result.stdout.splitlines()
+    assert lines[0].startswith('info string')
+    assert lines[-1] == 'readyok'
@@ -0,0 +1,118 @@
+import pytest
+
+pytest.importorskip('PIL')
+pytest.importorskip('tkinter')
+
+import chessington.ui as ui
+from chessington.engine.board import Board
+from chessington.engine.data import SQUARES, Square
+from chessington.ui.colours import Colour
+
+class StandInImages:
+    """
+    Hands out a description of each image in place of a PhotoImage, which would need a display.
+    """
+
+    def get_image(self, piece, colour):
+        return (type(piece), piece.player if piece else None, colour)
+
+class StandInButton:
+    def configure(self, image):
+        self.image = image
+
+class StandInWindow:
+    """
+    Holds the state play_game keeps on its window, with stand-in buttons for the squares.
+    """
+
+    def __init__(self):
+        self.square_buttons = {square: StandInButton() for square in SQUARES}
+        self.from_square = None
+        self.to_squares = []
+
+@pytest.fixture
+def redrawn(monkeypatch):
+    monkeypatch.setattr(ui, 'images', StandInImages())
+    squares = []
+    update_square = ui.update_square
+
+    def recording_update_square(window, board, square, colour=None):
+        squares.append(square)
+        update_square(window, board, square, colour)
+
+    monkeypatch.setattr(ui, 'update_square', recording_update_square)
+    return squares
+
+@pytest.fixture
+def window():
+    return StandInWindow()
+
+def images_shown(window):
+    return {square: button.image for square, button in window.square_buttons.items()}
+
+def test_changed_squares_are_the_old_and_new_highlights_and_the_moved_squares():
+
+    # Arrange
+    a1, a2, a3, b1, b3 = (Square.from_name(name) for name in ['a1', 'a2', 'a3', 'b1', 'b3'])
+
+    # Act
+    squares = ui.changed_squares(a2, [a3], None, [], (b1, b3))
+
+    # Assert
+    assert squares == {a2, a3, b1, b3}
+    assert ui.changed_squares(None, [], a1, [a2, a3]) == {a1, a2, a3}
+
+def test_selecting_a_piece_redraws_only_it_and_its_moves(window, redrawn):
+
+    # Arrange
+    board = Board.at_starting_position()
+    ui.update_pieces_and_colours(window, board)
+    redrawn.clear()
+    e2, e3, e4 = (Square.from_name(name) for name in ['e2', 'e3', 'e4'])
+
+    # Act
+    ui.set_highlights(window, board, e2, [e3, e4])
+
+    # Assert
+    assert sorted(redrawn, key=lambda square: square.index) == [e2, e3, e4]
+    assert window.square_buttons[e2].image[2] == Colour.FROM_SQUARE
+    assert window.square_buttons[e4].image[2] == Colour.TO_SQUARE
+
+def test_moving_redraws_the_old_highlights_and_the_moved_squares(window, redrawn):
+
+    # Arrange
+    board = Board.at_starting_position()
+    ui.update_pieces_and_colours(window, board)
+    e2, e3, e4 = (Square.from_name(name) for name in ['e2', 'e3', 'e4'])
+    ui.set_highlights(window, board, e2, [e3, e4])
+    redrawn.clear()
+
+    # Act
+    board.move_piece(e2, e4)
+    ui.set_highlights(window, board, None, [], (e2, e4))
+
+    # Assert
+    assert sorted(redrawn, key=lambda square: square.index) == [e2, e3, e4]
+    expected = StandInWindow()
+    ui.update_pieces_and_colours(expected, board)
+    assert images_shown(window) == images_shown(expected)
+
+def test_computer_move_redraws_only_the_moved_squares(window, redrawn):
+
+    # Arrange
+    board = Board.at_starting_position()
+    ui.update_pieces_and_colours(window, board)
+    e2, e4, e7, e5 = (Square.from_name(name) for name in ['e2', 'e4', 'e7', 'e5'])
+    board.move_piece(e2, e4)
+    ui.set_highlights(window, board, None, [], (e2, e4))
+    redrawn.clear()
+
+    # Act
+    board.move_piece(e7, e5)
+    ui.set_highlights(window, board, None, [], (e7, e5))
+
+    # Assert
+    assert sorted(redrawn, key=lambda square: square.index) == [e5, e7]
+    expected = StandInWindow()
+    ui.update_pieces_and_colours(expected, board)
+    assert images_shown(window) == images_shown(expected)